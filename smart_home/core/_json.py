@@ -0,0 +1,77 @@
+# smart_home/core/_json.py: leitura/escrita de JSON (orjson se instalado, senão json da stdlib)
+from __future__ import annotations
+import json
+from datetime import date, time
+from enum import Enum
+from typing import Any
+
+try:  # dependência opcional: mais rápido para gravar/ler o config.json
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+#--------------------------------------------------------------------------------------------------
+# SERIALIZAÇÃO DE TIPOS NÃO NATIVOS
+#--------------------------------------------------------------------------------------------------
+def _json_default(o: Any) -> Any:
+    """Converte valores que o JSON não conhece: Enum pelo nome, datas em ISO 8601 (como o
+    orjson grava), o resto (Path...) via str. Checagem por isinstance (sem try/except)."""
+    if isinstance(o, Enum):
+        return o.name
+    if isinstance(o, (date, time)):  # datetime é subclasse de date
+        return o.isoformat()
+    return str(o)
+
+# tipos que o JSON grava direto: o percurso de `_enums_por_nome` nem desce neles
+_ESCALARES = frozenset({str, int, float, bool, type(None)})
+
+def _enums_por_nome(o: Any) -> Any:
+    """`o` com os Enums (em valores de dicts/listas/tuplas, a qualquer profundidade) trocados
+    pelo nome. O orjson grava Enum pelo `.value` sem chamar o default, e o loader resolve
+    pelo nome; sem nenhum Enum, devolve o próprio `o` (nada é copiado)."""
+    if isinstance(o, Enum):
+        return o.name
+    if isinstance(o, dict):
+        novo = None
+        for k, v in o.items():
+            if type(v) in _ESCALARES:
+                continue
+            w = _enums_por_nome(v)
+            if w is not v:
+                if novo is None:
+                    novo = dict(o)
+                novo[k] = w
+        return o if novo is None else novo
+    if isinstance(o, (list, tuple)):
+        novo = None
+        for i, v in enumerate(o):
+            if type(v) in _ESCALARES:
+                continue
+            w = _enums_por_nome(v)
+            if w is not v:
+                if novo is None:
+                    novo = list(o)
+                novo[i] = w
+        return o if novo is None else novo
+    return o
+
+#--------------------------------------------------------------------------------------------------
+# API: loads/dumps COM A MESMA SAÍDA NOS DOIS BACKENDS
+#--------------------------------------------------------------------------------------------------
+def loads(dados: bytes | str) -> Any:
+    """Decodifica JSON a partir de bytes (UTF-8) ou str."""
+    if orjson is not None:
+        return orjson.loads(dados)
+    if isinstance(dados, bytes):
+        dados = dados.decode("utf-8")
+    return json.loads(dados)
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Codifica `obj` em JSON UTF-8 (bytes); `indent=True` usa 2 espaços, como o config.json."""
+    if orjson is not None:
+        opcoes = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(_enums_por_nome(obj), default=_json_default, option=opcoes)
+    if indent:
+        texto = json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default)
+    else:  # compacto como o orjson (sem espaço após ',' e ':')
+        texto = json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+    return texto.encode("utf-8")
@@ -1,16 +1,23 @@
 # smart_home/core/cli.py: CLI interativo com Rich
 from __future__ import annotations
 import argparse
+import re
+import sys
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, Dict
-from rich.console import Console
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from rich.console import Console, Group
+from rich.markup import escape
+from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich import box
-from rich.traceback import install as rich_traceback
 from smart_home.core.hub import Hub
-from smart_home.core.dispositivos import TipoDeDispositivo
+from smart_home.core.dispositivos import TIPO_STR, TipoDeDispositivo, nome_estado
 from smart_home.core.relatorios import (
     consumo_por_tomada,
     tempo_total_luzes_ligadas,
@@ -23,6 +30,7 @@ from smart_home.core.relatorios import (
 # enums úteis p/ coerção de parâmetros
 from smart_home.dispositivos.luz import CorLuz
 from smart_home.dispositivos.radio import EstacaoRadio
+from smart_home.core.logger import CsvLogger
 from smart_home.core.observers import (
     ConsoleObserver,
     CsvObserverTransitions, 
@@ -33,7 +41,57 @@ from smart_home.core.observers import (
 # CRIAR CONSOLE RICH
 #--------------------------------------------------------------------------------------------------------------------------------------------
 console = Console()              # tipo: Console
-rich_traceback(show_locals=True) # melhor rastreamento de erros
+# console para tabelas de dados (células já são texto puro): sem parse de markup, highlighter ou emoji
+_bulk = Console(highlight=False, markup=False, emoji=False)
+
+def _prompt_ansi(markup: str) -> str:
+    """Renderiza uma vez o markup de um prompt para string ANSI (usada com `_ler()`)."""
+    with console.capture() as cap:
+        console.print(markup, end="")
+    return cap.get()
+
+_ANSI_ESC = re.compile(r"\x1b\[[0-9;]*m")
+
+@lru_cache(maxsize=32)
+def _marcar_ansi(prompt: str) -> str:
+    """Marca as sequências ANSI do prompt como não imprimíveis (\\001...\\002), para o
+    `readline` calcular a largura do prompt (cursor, histórico, quebra de linha)."""
+    return _ANSI_ESC.sub(lambda m: f"\001{m.group(0)}\002", prompt)
+
+def _ler(prompt: str) -> str:
+    """Lê uma linha para um prompt já renderizado (ver `_prompt_ansi`).
+
+    Em terminal usa `input()` (edição de linha/histórico); com stdin redirecionado (scripts,
+    pipes) escreve o prompt e lê direto com `sys.stdin.readline()`. Fim da entrada levanta
+    EOFError, como `input()`.
+    """
+    if sys.stdin.isatty():
+        # sem readline carregado o input() não edita a linha: prompt vai como está
+        return input(_marcar_ansi(prompt) if "readline" in sys.modules else prompt)
+    sys.stdout.write(prompt)
+    linha = sys.stdin.readline()
+    if not linha:
+        raise EOFError
+    return linha.rstrip("\n")
+
+# prompts repetidos: renderizados uma vez, lidos com _ler() sem passar pelo Prompt.ask
+_PARAM_PROMPT = _prompt_ansi("[dim]param[/]: ")
+_ID_PROMPT = _prompt_ansi("\n[bold]ID do dispositivo[/]: ")
+
+# acima deste número de linhas o Table do Rich fica lento; usa texto simples
+MAX_RICH_ROWS = 200
+# acima deste número de dispositivos a listagem antes de pedir o ID é omitida (use a opção 1)
+SHOW_LIST_THRESHOLD = MAX_RICH_ROWS
+
+def _texto_tabular(titulo: str, cabecalho: tuple, linhas: list) -> str:
+    """Formata uma tabela como texto separado por TAB."""
+    out = [titulo, "\t".join(cabecalho)]
+    out.extend("\t".join(map(str, linha)) for linha in linhas)
+    return "\n".join(out) + "\n"
+
+def _dump_texto(titulo: str, cabecalho: tuple, linhas: list) -> None:
+    """Escreve uma tabela como texto separado por TAB, sem passar pelo renderer do Rich."""
+    console.file.write(_texto_tabular(titulo, cabecalho, linhas))
 #--------------------------------------------------------------------------------------------------------------------------------------------
 # HELPERS CLI PARA LISTAR/EXECUTAR ROTINAS
 #--------------------------------------------------------------------------------------------------------------------------------------------
@@ -44,14 +102,18 @@ def listar_rotinas(hub: Hub):
         hub (Hub): Instância do hub de automação.
     """
     if not hub.rotinas:
-        console.print(Panel.fit("[yellow]Nenhuma rotina configurada no JSON.[/]", border_style="yellow"))
+        _aviso("Nenhuma rotina configurada no JSON.")
+        return
+    if len(hub.rotinas) > MAX_RICH_ROWS:
+        _dump_texto("Rotinas disponíveis", ("Nome", "Passos"),
+                    [(nome, len(passos)) for nome, passos in hub.rotinas.items()])
         return
     t = Table(title="Rotinas disponíveis", box=box.SIMPLE)
     t.add_column("Nome", style="cyan")
     t.add_column("Passos", justify="right")
     for nome, passos in hub.rotinas.items():
         t.add_row(nome, str(len(passos)))
-    console.print(t)
+    _bulk.print(t)
 
 def executar_rotina_cli(hub: Hub):
     """Executa uma rotina selecionada pelo usuário.
@@ -64,17 +126,34 @@ def executar_rotina_cli(hub: Hub):
         return
     nome = Prompt.ask("[bold]Nome da rotina[/]").strip()
     if nome not in hub.rotinas:
-        console.print(Panel.fit(f"[red]Rotina '{nome}' não encontrada.[/]", border_style="red"))
+        _err(f"Rotina '{escape(nome)}' não encontrada.")
         return
-    from rich.progress import track
+    from rich.progress import Progress  # ~4 ms de import: carregado só ao executar rotina
     passos = hub.rotinas[nome]
-    
-    # feedback visual
-    for _ in track(range(len(passos)), description=f"Executando '{nome}'..."):
-        pass  # só barra de progresso estética; execução real abaixo
 
     try:
-        resumo = hub.executar_rotina(nome)
+        # progresso real: avança a cada passo executado pelo hub
+        resultados = []
+        with hub.batch_events(), Progress(console=console, transient=True) as progresso:
+            tarefa = progresso.add_task(f"Executando '{nome}'...", total=len(passos))
+            for r in hub.executar_rotina_iter(nome):
+                resultados.append(r)
+                progresso.advance(tarefa)
+        resumo = Hub.resumo_rotina(nome, resultados)  # mesmos totais do evento ROTINA_EXECUTADA
+        totais = Panel.fit(Text.assemble(
+            ("Total:", "bold"), f" {resumo['total']}  ",
+            ("Sucesso:", "green"), f" {resumo['sucesso']}  ",
+            ("Falha:", "red"), f" {resumo['falha']}",
+        ), border_style="cyan")
+        # rotinas muito longas: resultado em texto simples
+        if len(resumo["resultados"]) > MAX_RICH_ROWS:
+            _dump_texto(f"Resultado — {nome}", ("#", "ID", "Comando", "OK?", "Antes", "Depois", "Erro"), [
+                (r["passo"], r["id"], r["cmd"], "OK" if r["ok"] else "FALHA",
+                 r.get("antes", ""), r.get("depois", ""), r.get("erro", ""))
+                for r in resumo["resultados"]
+            ])
+            console.print(totais)
+            return
         # imprime um resumo bonito
         t = Table(title=f"Resultado — {nome}", box=box.SIMPLE_HEAVY)
         t.add_column("#", justify="right", style="dim")
@@ -91,15 +170,10 @@ def executar_rotina_cli(hub: Hub):
                 r.get("antes",""), r.get("depois",""),
                 r.get("erro",""),
             )
-        console.print(t)
-        console.print(Panel.fit(
-            f"[bold]Total:[/] {resumo['total']}  "
-            f"[green]Sucesso:[/] {resumo['sucesso']}  "
-            f"[red]Falha:[/] {resumo['falha']}",
-            border_style="cyan"
-        ))
+        # tabela + totais num único print
+        _bulk.print(Group(t, totais))
     except Exception as e:
-        console.print(Panel.fit(f"[red]Erro executando rotina:[/] {e}", border_style="red"))
+        _err(f"Erro executando rotina: {escape(str(e))}")
         
 #--------------------------------------------------------------------------------------------------------------------------------------------
 # HELPERS VISUAIS (RICH)
@@ -108,16 +182,64 @@ def header():
     """Exibe o cabeçalho do Hub"""
     console.rule("[italic bright_white]Smart Home Hub[/]")
 
-def _estado_str(estado) -> str:
-    """Converte o estado do dispositivo em uma string legível.
+# mensagens de status de uma linha: print simples (Panel só para blocos/resultados)
+def _ok(msg: str) -> None:
+    """Mensagem de sucesso (markup; partes vindas do usuário/exceções vão com `escape`)."""
+    console.print(f"[bold green]✔[/] {msg}")
 
-    Args:
-        estado (Any): O estado do dispositivo.
+def _err(msg: str) -> None:
+    """Mensagem de erro."""
+    console.print(f"[bold red]✘[/] {msg}")
 
-    Returns:
-        str: A representação em string do estado.
+def _aviso(msg: str) -> None:
+    """Mensagem de aviso."""
+    console.print(f"[bold yellow]![/] {msg}")
+
+# estado -> nome legível (memoizado em core.dispositivos: estados das FSMs são Enums/singletons)
+_estado_str = nome_estado
+
+
+# atributos de cada linha da listagem, lidos de uma vez (em C) por dispositivo
+_CAMPOS_LINHA = attrgetter("id", "nome", "tipo", "estado")
+# colunas do relatório de consumo, extraídas de uma vez por linha
+_CAMPOS_CONSUMO = itemgetter("id_dispositivo", "potencia_w", "horas_ligada", "total_wh")
+_CAMPOS_CONSUMO_WH = itemgetter("id_dispositivo", "total_wh")
+
+def _montar_lista_dispositivos(hub: Hub, limit: int) -> Table | str:
+    """Monta a listagem de dispositivos: Table do Rich até `limit` linhas, texto simples acima disso."""
+    campos, estado_str, tipo_str = _CAMPOS_LINHA, _estado_str, TIPO_STR
+    linhas = [(i, n, tipo_str[tp], estado_str(st)) for i, n, tp, st in map(campos, hub.dispositivos.values())]
+    if len(linhas) > limit:
+        return _texto_tabular("Dispositivos Registrados", ("ID", "Nome", "Tipo", "Estado"), linhas)
+    t = Table(title="Dispositivos Registrados", box=box.SIMPLE_HEAVY)
+    t.add_column("ID", style="cyan", no_wrap=True)
+    t.add_column("Nome", style="bold")
+    t.add_column("Tipo", style="magenta")
+    t.add_column("Estado", style="green")
+    add_row = t.add_row
+    for linha in linhas:
+        add_row(*linha)
+    return t
+
+# última listagem montada: ((hub, versao, qtd, limit), Table | str)
+_lista_cache: tuple | None = None
+
+def _render_devices(hub: Hub, limit: int = MAX_RICH_ROWS):
+    """Imprime os dispositivos do hub, reaproveitando a última listagem se o hub não mudou.
+
+    Args:
+        hub (Hub): Instância do hub de automação.
+        limit (int): Máximo de linhas renderizadas com Rich.
     """
-    return getattr(estado, "name", str(estado))
+    global _lista_cache
+    chave = (hub, hub.versao, len(hub), limit)
+    if _lista_cache is None or _lista_cache[0] != chave:
+        _lista_cache = (chave, _montar_lista_dispositivos(hub, limit))
+    saida = _lista_cache[1]
+    if isinstance(saida, str):
+        console.file.write(saida)
+    else:
+        _bulk.print(saida)
 
 
 def listar_dispositivos(hub: Hub):
@@ -126,16 +248,16 @@ def listar_dispositivos(hub: Hub):
     Args:
         hub (Hub): Instância do hub de automação.
     """
-    t = Table(title="Dispositivos Registrados", box=box.SIMPLE_HEAVY)
-    t.add_column("ID", style="cyan", no_wrap=True)
-    t.add_column("Nome", style="bold")
-    t.add_column("Tipo", style="magenta")
-    t.add_column("Estado", style="green")
-    for d in hub.listar():
-        t.add_row(d.id, d.nome, d.tipo.value, _estado_str(d.estado))
-    console.print(t)
+    _render_devices(hub)
     
 
+def _listar_antes_de_escolher(hub: Hub) -> None:
+    """Mostra a lista de dispositivos antes de um prompt de ID; omitida só para hubs grandes
+    (acima de SHOW_LIST_THRESHOLD, use a opção 1)."""
+    if len(hub) <= SHOW_LIST_THRESHOLD:
+        listar_dispositivos(hub)
+
+
 def escolher_dispositivo(hub: Hub):
     """Permite ao usuário escolher um dispositivo da lista.
 
@@ -145,44 +267,58 @@ def escolher_dispositivo(hub: Hub):
     Returns:
         Dispositivo | None: O dispositivo escolhido ou None se não encontrado.
     """
-    listar_dispositivos(hub)
-    id_ = Prompt.ask("\n[bold]ID do dispositivo[/]", default="").strip()
+    _listar_antes_de_escolher(hub)
+    id_ = _ler(_ID_PROMPT).strip()
     disp = hub.obter(id_)
     if not disp:
         console.print(":warning: [yellow]Dispositivo não encontrado.[/]")
     return disp
 
 
-def mostrar_atributos(disp):
+def _tabela_atributos(disp, attrs: Dict[str, Any] | None = None) -> Table:
+    """Monta a tabela de atributos do dispositivo (sem imprimir)."""
+    if attrs is None:
+        attrs = disp.atributos()
+    t = Table(title=f"Atributos — {disp.nome}", box=box.SIMPLE)
+    t.add_column("Atributo", style="cyan")
+    t.add_column("Valor", style="green")
+    add_row = t.add_row
+    for k, v in attrs.items():
+        add_row(str(k), str(v))
+    return t
+
+def _tabela_comandos(disp, cmds: Mapping[str, str] | None = None) -> Table:
+    """Monta a tabela de comandos disponíveis do dispositivo (sem imprimir)."""
+    if cmds is None:
+        cmds = disp.comandos_disponiveis()
+    t = Table(title=f"Comandos — {disp.nome}", box=box.MINIMAL_DOUBLE_HEAD)
+    t.add_column("Comando", style="cyan", no_wrap=True)
+    t.add_column("Descrição", style="white")
+    add_row = t.add_row
+    for linha in cmds.items():  # nome/descrição já são str
+        add_row(*linha)
+    return t
+
+def mostrar_atributos(disp, attrs: Dict[str, Any] | None = None):
     """Exibe os atributos do dispositivo.
 
     Args:
         disp (Dispositivo): O dispositivo cujos atributos serão exibidos.
+        attrs (dict, opcional): Atributos já obtidos pelo chamador (evita nova chamada a `atributos()`).
     """
-    attrs = disp.atributos()
-    t = Table(title=f"Atributos — {disp.nome}", box=box.SIMPLE)
-    t.add_column("Atributo", style="cyan")
-    t.add_column("Valor", style="green")
-    for k, v in attrs.items():
-        t.add_row(str(k), str(v))
-    console.print(t)
+    _bulk.print(_tabela_atributos(disp, attrs))
 
-def mostrar_comandos(disp):
+def mostrar_comandos(disp, cmds: Mapping[str, str] | None = None):
     """Exibe os comandos disponíveis para o dispositivo.
 
     Args:
         disp (Dispositivo): O dispositivo cujos comandos serão exibidos.
+        cmds (dict, opcional): Comandos já obtidos pelo chamador (evita nova chamada a `comandos_disponiveis()`).
     """
-    cmds = disp.comandos_disponiveis()
-    t = Table(title=f"Comandos — {disp.nome}", box=box.MINIMAL_DOUBLE_HEAD)
-    t.add_column("Comando", style="cyan", no_wrap=True)
-    t.add_column("Descrição", style="white")
-    for k, v in cmds.items():
-        t.add_row(k, v)
-    console.print(t)
+    _bulk.print(_tabela_comandos(disp, cmds))
 
-def mostrar_menu():
-    """Exibe o menu principal do sistema"""
+def _build_menu_grid() -> Table:
+    """Monta o grid (estático) com as opções do menu principal."""
     grid = Table.grid(padding=1)
     grid.add_column(justify="right", style="cyan", no_wrap=True)
     grid.add_column(style="white")
@@ -200,7 +336,14 @@ def mostrar_menu():
     ]
     for k, v in itens:
         grid.add_row(k, v)
-    console.print(Panel(grid, title="[bold]MENU[/]", border_style="cyan"))
+    return grid
+
+# o menu é constante: construído uma única vez no import
+_MENU_PANEL = Panel(_build_menu_grid(), title="[bold]MENU[/]", border_style="cyan")
+
+def mostrar_menu():
+    """Exibe o menu principal do sistema"""
+    console.print(_MENU_PANEL)
 
 #--------------------------------------------------------------------------------------------------------------------------------------------
 # PARSING UTILITÁRIO (INT + ENUMS CONHECIDOS)
@@ -214,12 +357,26 @@ def _try_int(s: str):
     Returns:
         int | str: O valor convertido em inteiro ou a string original em caso de falha.
     """
+    if isinstance(s, str):
+        digitos = s.strip()
+        if digitos[:1] in ("-", "+"):
+            digitos = digitos[1:]
+        # caso comum (ex.: cor=quente) sem lançar exceção: int() exige começar por dígito;
+        # o resto ("1_000" etc.) fica com o int()
+        if not digitos[:1].isdecimal():
+            return s
     try:
         return int(s)
     except Exception:
         return s
 
 
+# nome -> membro para os enums aceitos como parâmetro (CorLuz tem precedência)
+_ENUM_LOOKUP: Mapping[str, Any] = MappingProxyType({
+    **{m.name: m for m in EstacaoRadio},
+    **{m.name: m for m in CorLuz},
+})
+
 def _coerce_enum(value: Any):
     """Tenta converter um valor para um enum conhecido.
 
@@ -231,18 +388,15 @@ def _coerce_enum(value: Any):
     """
     if not isinstance(value, str):
         return value
-    v = value.strip().upper()
-    # Luz
-    try:
-        return CorLuz[v]
-    except Exception:
-        pass
-    # Rádio
-    try:
-        return EstacaoRadio[v]
-    except Exception:
-        pass
-    return value
+    return _ENUM_LOOKUP.get(value.strip().upper(), value)
+
+# painel de instruções (estático)
+_PARAMETROS_PANEL = Panel.fit(
+    "[bold]Digite parâmetros no formato[/] [cyan]chave=valor[/].\n"
+    "Ex.: [green]valor=70[/], [green]cor=quente[/], [green]estacao=JAZZ[/]\n"
+    "Pressione [bold]<Enter>[/] sem nada para concluir.",
+    title="Parâmetros", border_style="cyan"
+)
 
 def ler_parametros_interativos():
     """Lê parâmetros interativos do usuário.
@@ -250,107 +404,124 @@ def ler_parametros_interativos():
     Returns:
         Dict[str, Any]: Um dicionário com os parâmetros lidos.
     """
-    console.print(Panel.fit(
-        "[bold]Digite parâmetros no formato[/] [cyan]chave=valor[/].\n"
-        "Ex.: [green]valor=70[/], [green]cor=quente[/], [green]estacao=JAZZ[/]\n"
-        "Pressione [bold]<Enter>[/] sem nada para concluir.",
-        title="Parâmetros", border_style="cyan"
-    ))
+    console.print(_PARAMETROS_PANEL)
     args: Dict[str, Any] = {}
     while True:
-        linha = Prompt.ask("[dim]param[/]", default="")
+        linha = _ler(_PARAM_PROMPT)
         if not linha.strip():
             break
-        if "=" not in linha:
+        k, sep, v = linha.partition("=")
+        if not sep:
             console.print("[yellow]Use o formato chave=valor.[/]")
             continue
-        k, v = [p.strip() for p in linha.split("=", 1)]
-        v = _coerce_enum(_try_int(v))
-        args[k] = v
+        args[k.strip()] = _coerce_enum(_try_int(v.strip()))
     return args
 
 #--------------------------------------------------------------------------------------------------------------------------------------------
 # FLUXO DE COMANDOS CLI
 #--------------------------------------------------------------------------------------------------------------------------------------------
+# dicas de parâmetros/atributos por tipo de dispositivo (listas de enums unidas uma única vez)
+_CORES = ", ".join(c.name for c in CorLuz)
+_ESTACOES = ", ".join(e.name for e in EstacaoRadio)
+
+_CMD_HINTS: Dict[TipoDeDispositivo, Tuple[str, ...]] = {
+    TipoDeDispositivo.LUZ: (f"cor={_CORES}", "valor(brilho)=0..100"),
+    TipoDeDispositivo.RADIO: (f"estacao={_ESTACOES}", "valor(volume)=0..100"),
+    TipoDeDispositivo.PERSIANA: ("percentual/abertura/valor=0..100 (0 FECHADA, 100 ABERTA, 1-99 PARCIAL)",),
+    TipoDeDispositivo.CAFETEIRA: ("Sem parâmetros nos comandos atuais",),
+}
+
+_ATTR_HINTS: Dict[TipoDeDispositivo, Tuple[str, ...]] = {
+    TipoDeDispositivo.LUZ: ("brilho: 0..100", f"cor: {_CORES}"),
+    TipoDeDispositivo.RADIO: ("volume: 0..100", f"estacao: {_ESTACOES}"),
+    TipoDeDispositivo.PERSIANA: ("abertura: 0..100 (0 FECHADA,100 ABERTA,1-99 PARCIAL)",),
+}
+
 def executar_comando(hub: Hub, disp):
     """Executa um comando em um dispositivo."""
-    mostrar_comandos(disp)
+    cmds = disp.comandos_disponiveis()  # obtido uma vez: exibição + validação
+    mostrar_comandos(disp, cmds=cmds)
     
-    # hints contextuais para parâmetros aceitos
-    try:
-        from smart_home.dispositivos.luz import Luz
-        from smart_home.dispositivos.radio import Radio
-        from smart_home.dispositivos.persiana import Persiana
-        from smart_home.dispositivos.cafeteira import CafeteiraCapsulas
-    except Exception:
-        Luz = Radio = Persiana = CafeteiraCapsulas = object  # fallbacks
-
-    hints = []
-    if isinstance(disp, Luz): 
-        cores = ", ".join(c.name for c in CorLuz) # listar nomes das cores
-        hints.append(f"cor={cores}")          
-        hints.append("valor(brilho)=0..100")      # brilho 0..100
-    if isinstance(disp, Radio):
-        estacoes = ", ".join(e.name for e in EstacaoRadio) # listar nomes das estações
-        hints.append(f"estacao={estacoes}")
-        hints.append("valor(volume)=0..100")               # volume 0..100
-    if isinstance(disp, Persiana):                         # abertura 0..100
-        hints.append("percentual/abertura/valor=0..100 (0 FECHADA, 100 ABERTA, 1-99 PARCIAL)")
-    if isinstance(disp, CafeteiraCapsulas):
-        hints.append("Sem parâmetros nos comandos atuais")
+    # hints contextuais para parâmetros aceitos (tabela por tipo)
+    hints = _CMD_HINTS.get(disp.tipo, ())
     if hints:
         t = Table(title="Parâmetros Aceitos", box=box.SIMPLE)
         t.add_column("Formato / Opções", style="cyan")
         for h in hints:
             t.add_row(h)
-        console.print(t)
+        _bulk.print(t)
     cmd = Prompt.ask("\n[bold]Comando[/]").strip()
-    if cmd not in disp.comandos_disponiveis():
+    if cmd not in cmds:
         console.print(":no_entry: [red]Comando inválido para esse dispositivo.[/]")
         return
     args = ler_parametros_interativos()
     try:
-        hub.executar_comando(disp.id, cmd, **args)
-        console.print(Panel.fit("[bold green]OK[/] comando executado!", border_style="green"))
+        with hub.batch_events():
+            hub.executar_comando(disp.id, cmd, **args)
+        _ok("Comando executado!")
     except Exception as e:
-        console.print(Panel.fit(f"[red]Erro:[/] {e}", border_style="red"))
+        _err(f"Erro: {escape(str(e))}")
 
 def alterar_atributo(hub: Hub, disp):
     """Altera um atributo de um dispositivo."""
-    mostrar_atributos(disp)
-    # Hints rápidos sobre atributos editáveis
-    try:
-        from smart_home.dispositivos.luz import Luz
-        from smart_home.dispositivos.radio import Radio
-        from smart_home.dispositivos.persiana import Persiana
-    except Exception:
-        Luz = Radio = Persiana = object
-    dicas = []
-    if isinstance(disp, Luz):
-        dicas.append("brilho: 0..100")
-        cores = ", ".join(c.name for c in CorLuz)
-        dicas.append(f"cor: {cores}")
-    if isinstance(disp, Radio):
-        dicas.append("volume: 0..100")
-        estacoes = ", ".join(e.name for e in EstacaoRadio)
-        dicas.append(f"estacao: {estacoes}")
-    if isinstance(disp, Persiana):
-        dicas.append("abertura: 0..100 (0 FECHADA,100 ABERTA,1-99 PARCIAL)")
+    attrs = disp.atributos()
+    mostrar_atributos(disp, attrs=attrs)
+    # Hints rápidos sobre atributos editáveis (tabela por tipo)
+    dicas = _ATTR_HINTS.get(disp.tipo, ())
     if dicas:
         t = Table(title="Atributos Editáveis", box=box.SIMPLE)
         t.add_column("Atributo / Faixa", style="magenta")
         for d in dicas:
             t.add_row(d)
-        console.print(t)
+        _bulk.print(t)
     k = Prompt.ask("\n[bold]Atributo[/]").strip()
     v = Prompt.ask("[bold]Novo valor[/]").strip()
     v = _coerce_enum(_try_int(v))
     try:
         hub.alterar_atributo(disp.id, k, v)
-        console.print(Panel.fit("[bold green]OK[/] atributo alterado!", border_style="green"))
+        _ok("Atributo alterado!")
     except Exception as e:
-        console.print(Panel.fit(f"[red]Erro:[/] {e}", border_style="red"))
+        _err(f"Erro: {escape(str(e))}")
+
+
+_RELATORIO_OPCOES = (
+    ("1", "Consumo por tomada (Wh)"),
+    ("2", "Tempo total luzes ligadas"),
+    ("3", "Top dispositivos mais usados"),
+    ("4", "Cafés por dia"),
+    ("5", "Distribuição comandos por tipo"),
+    ("6", "Resumo agregado"),
+    ("0", "Voltar"),
+)
+_RELATORIO_CHOICES = [k for k, _ in _RELATORIO_OPCOES]
+
+def _build_relatorios_grid() -> Table:
+    """Monta o grid (estático) com as opções do submenu de relatórios."""
+    grid = Table.grid(padding=1)
+    grid.add_column(style="cyan", justify="right")
+    grid.add_column(style="white")
+    for k, v in _RELATORIO_OPCOES:
+        grid.add_row(k, v)
+    return grid
 
+# submenu constante: construído uma única vez no import
+_RELATORIOS_PANEL = Panel(_build_relatorios_grid(), title="[bold]Relatórios[/]", border_style="cyan")
+
+def _parse_iso(texto: str, rotulo: str) -> Optional[datetime]:
+    """Converte data/hora ISO digitada; vazio ou inválido -> None (avisando se inválido).
+
+    Formato conferido antes (AAAA-MM-DD...) para não lançar exceção nos casos óbvios.
+    """
+    texto = texto.strip()
+    if not texto:
+        return None
+    if len(texto) >= 10 and texto[4] == "-" and texto[7] == "-":
+        try:
+            return datetime.fromisoformat(texto)
+        except ValueError:
+            pass
+    console.print(f"[yellow]Formato de {rotulo} inválido, ignorando.[/]")
+    return None
 
 def gerar_relatorio(hub: Hub, cfg_path: Path):
     """Submenu de relatórios funcionais.
@@ -363,54 +534,27 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
       5) Distribuição comandos por tipo
       6) Resumo agregado
     """
+    CsvLogger().flush()  # os relatórios leem os CSVs: espera a thread escritora gravar a fila
     logs_dir = Path("data/logs")
     transitions_csv = logs_dir / "transitions.csv"
     events_csv = logs_dir / "events.csv"
     config_json = cfg_path
 
     if not transitions_csv.exists():
-        console.print(Panel.fit(f"[red]Arquivo não encontrado:[/] {transitions_csv}", border_style="red"))
+        _err(f"Arquivo não encontrado: {escape(str(transitions_csv))}")
         return
     # events e config só são obrigatórios em alguns relatórios; config deve existir
     if not config_json.exists():
-        console.print(Panel.fit(f"[red]Config não encontrada:[/] {config_json}", border_style="red"))
+        _err(f"Config não encontrada: {escape(str(config_json))}")
         return
 
-    grid = Table.grid(padding=1)
-    grid.add_column(style="cyan", justify="right")
-    grid.add_column(style="white")
-    opcoes = [
-        ("1", "Consumo por tomada (Wh)"),
-        ("2", "Tempo total luzes ligadas"),
-        ("3", "Top dispositivos mais usados"),
-        ("4", "Cafés por dia"),
-        ("5", "Distribuição comandos por tipo"),
-        ("6", "Resumo agregado"),
-        ("0", "Voltar"),
-    ]
-    for k, v in opcoes:
-        grid.add_row(k, v)
-    console.print(Panel(grid, title="[bold]Relatórios[/]", border_style="cyan"))
-
-    escolha = Prompt.ask("[bold]Relatório[/]", choices=[k for k, _ in opcoes], default="0")
+    console.print(_RELATORIOS_PANEL)
+    escolha = Prompt.ask("[bold]Relatório[/]", choices=_RELATORIO_CHOICES, default="0")
     if escolha == "0":
         return
 
-    inicio_str = Prompt.ask("Início (ISO) ou vazio", default="").strip()
-    fim_str = Prompt.ask("Fim (ISO) ou vazio", default="").strip()
-    from datetime import datetime
-    inicio = None
-    fim = None
-    if inicio_str:
-        try:
-            inicio = datetime.fromisoformat(inicio_str)
-        except Exception:
-            console.print("[yellow]Formato de início inválido, ignorando.[/]")
-    if fim_str:
-        try:
-            fim = datetime.fromisoformat(fim_str)
-        except Exception:
-            console.print("[yellow]Formato de fim inválido, ignorando.[/]")
+    inicio = _parse_iso(Prompt.ask("Início (ISO) ou vazio", default=""), "início")
+    fim = _parse_iso(Prompt.ask("Fim (ISO) ou vazio", default=""), "fim")
 
     try:
         if escolha == "1":  # consumo
@@ -418,14 +562,20 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
             if not dados:
                 console.print("[yellow]Sem dados de consumo no período.[/]")
                 return
+            linhas = [(did, "%.0f" % w, "%.3f" % h, "%.2f" % wh)
+                      for did, w, h, wh in map(_CAMPOS_CONSUMO, dados)]
+            if len(linhas) > MAX_RICH_ROWS:
+                _dump_texto("Consumo por Tomada (Wh)", ("ID", "Potência W", "Horas Ligada", "Total Wh"), linhas)
+                return
             t = Table(title="Consumo por Tomada (Wh)", box=box.SIMPLE_HEAVY)
             t.add_column("ID", style="cyan")
             t.add_column("Potência W", justify="right")
             t.add_column("Horas Ligada", justify="right")
             t.add_column("Total Wh", justify="right")
-            for r in dados:
-                t.add_row(r["id_dispositivo"], f"{r['potencia_w']:.0f}", f"{r['horas_ligada']:.3f}", f"{r['total_wh']:.2f}")
-            console.print(t)
+            add_row = t.add_row
+            for linha in linhas:
+                add_row(*linha)
+            _bulk.print(t)
 
         elif escolha == "2":  # tempo luzes
             dados = tempo_total_luzes_ligadas(transitions_csv, config_json, inicio, fim)
@@ -438,7 +588,7 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
             t.add_column("HH:MM:SS", justify="right")
             for r in dados:
                 t.add_row(r["id_dispositivo"], str(r["segundos_ligada"]), r["hhmmss"])
-            console.print(t)
+            _bulk.print(t)
 
         elif escolha == "3":  # top usados
             if not events_csv.exists():
@@ -453,7 +603,7 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
             t.add_column("Eventos", justify="right")
             for i, (did, qtd) in enumerate(dados, start=1):
                 t.add_row(str(i), did, str(qtd))
-            console.print(t)
+            _bulk.print(t)
 
         elif escolha == "4":  # cafés por dia
             dados = cafes_por_dia(transitions_csv, inicio, fim)
@@ -468,7 +618,7 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
                 t.add_row(r["data"], str(r["preparos_no_dia"]))
             if not dados:
                 console.print("[yellow]Nenhum café no período.[/]")
-            console.print(t)
+            _bulk.print(t)
 
         elif escolha == "5":  # dist comandos
             if not events_csv.exists():
@@ -483,7 +633,7 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
             t.add_column("Qtd", justify="right")
             for tipo, qtd in dados:
                 t.add_row(tipo, str(qtd))
-            console.print(t)
+            _bulk.print(t)
 
         elif escolha == "6":  # resumo agregado
             if not events_csv.exists():
@@ -493,46 +643,75 @@ def gerar_relatorio(hub: Hub, cfg_path: Path):
             t1 = Table(title="Consumo Tomadas", box=box.SIMPLE)
             t1.add_column("ID")
             t1.add_column("Wh", justify="right")
-            for r in data["consumo_tomadas"]:
-                if r["id_dispositivo"] == "__TOTAL__":
-                    continue
-                t1.add_row(r["id_dispositivo"], f"{r['total_wh']:.2f}")
-            console.print(t1)
+            for did, wh in map(_CAMPOS_CONSUMO_WH, data["consumo_tomadas"]):
+                if did != "__TOTAL__":
+                    t1.add_row(did, "%.2f" % wh)
             # top uso
             t2 = Table(title="Top Uso", box=box.SIMPLE)
             t2.add_column("ID")
             t2.add_column("Eventos", justify="right")
             for did, qtd in data["top_uso"]:
                 t2.add_row(did, str(qtd))
-            console.print(t2)
-            # cafés
-            console.print(Panel.fit(f"Cafés preparados: [bold]{data['cafes_preparados']}[/]", border_style="green"))
             # dist comandos
             t3 = Table(title="Comandos por Tipo", box=box.SIMPLE)
             t3.add_column("Tipo")
             t3.add_column("Qtd", justify="right")
             for tipo, qtd in data["dist_comandos_tipo"]:
                 t3.add_row(tipo, str(qtd))
-            console.print(t3)
             # luzes tempo
             t4 = Table(title="Tempo Luzes", box=box.SIMPLE)
             t4.add_column("Luz")
             t4.add_column("Segundos", justify="right")
             for r in data["luzes_tempo"]:
                 t4.add_row(r["id_dispositivo"], str(r["segundos_ligada"]))
-            console.print(t4)
+            # cafés + todas as tabelas num único print
+            cafes = Panel.fit(Text.assemble("Cafés preparados: ", (str(data["cafes_preparados"]), "bold")), border_style="green")
+            _bulk.print(Group(t1, t2, cafes, t3, t4))
     except Exception as e:
-        console.print(Panel.fit(f"[red]Erro gerando relatório:[/] {e}", border_style="red"))
+        _err(f"Erro gerando relatório: {escape(str(e))}")
+
+# TipoDeDispositivo é um Enum fechado: o painel de tipos não muda em tempo de execução
+_TIPOS_PANEL = Panel.fit(
+    f"Tipos suportados: [bold]{', '.join(t.value for t in TipoDeDispositivo)}[/]",
+    title="Adicionar", border_style="cyan"
+)
+
+def _nome_de(enum_cls):
+    """Coercer para prompts de enum: devolve o nome do membro de `enum_cls` (ou a string digitada)."""
+    def _conv(valor: str) -> str:
+        membro = _coerce_enum(valor)
+        return membro.name if isinstance(membro, enum_cls) else str(membro)
+    return _conv
+
+# especificação dos prompts por tipo: (kwarg de hub.adicionar, texto, default, coercer)
+_DEVICE_SPECS: Dict[TipoDeDispositivo, tuple] = {
+    TipoDeDispositivo.PORTA: (),
+    TipoDeDispositivo.LUZ: (
+        ("brilho", "brilho (0-100) [0]", "0", _try_int),
+        ("cor", "cor [QUENTE/FRIA/NEUTRA] [NEUTRA]", "NEUTRA", _nome_de(CorLuz)),
+    ),
+    TipoDeDispositivo.TOMADA: (
+        ("potencia_w", "potencia_w (>=0) [1000]", "1000", _try_int),
+    ),
+    TipoDeDispositivo.CAFETEIRA: (),
+    TipoDeDispositivo.RADIO: (
+        ("volume", "volume (0-100) [0]", "0", _try_int),
+        ("estacao", "estacao (MPB/ROCK/JAZZ/...) [MPB]", "MPB", _nome_de(EstacaoRadio)),
+    ),
+    TipoDeDispositivo.PERSIANA: (
+        ("abertura", "abertura_inicial (0-100) [0]", "0", _try_int),
+    ),
+}
+
+# nome (maiúsculo) -> TipoDeDispositivo
+_TIPO_BY_NAME: Dict[str, TipoDeDispositivo] = {t.name: t for t in TipoDeDispositivo}
 
 def adicionar_dispositivo(hub: Hub):
     """Adiciona um novo dispositivo ao hub."""
-    tipos = ", ".join(t.value for t in TipoDeDispositivo)
-    console.print(Panel.fit(f"Tipos suportados: [bold]{tipos}[/]", title="Adicionar", border_style="cyan"))
+    console.print(_TIPOS_PANEL)
 
-    tipo_str = Prompt.ask("tipo").strip().upper()
-    try:
-        tipo = TipoDeDispositivo[tipo_str]
-    except Exception:
+    tipo = _TIPO_BY_NAME.get(Prompt.ask("tipo").strip().upper())
+    if tipo is None:
         console.print("[red]Tipo inválido.[/]")
         return
 
@@ -543,48 +722,109 @@ def adicionar_dispositivo(hub: Hub):
     nome = Prompt.ask("nome").strip()
 
     try:
-        if tipo == TipoDeDispositivo.PORTA:
-            hub.adicionar("PORTA", id_, nome)
+        attrs = {chave: conv(Prompt.ask(texto, default=default))
+                 for chave, texto, default, conv in _DEVICE_SPECS[tipo]}
+        hub.adicionar(tipo.value, id_, nome, **attrs)
+        _ok(f"Dispositivo [cyan]{escape(id_)}[/] adicionado.")
+    except Exception as e:
+        _err(f"Erro criando dispositivo: {escape(str(e))}")
 
-        elif tipo == TipoDeDispositivo.LUZ:
-            brilho = _try_int(Prompt.ask("brilho (0-100) [0]", default="0"))
-            cor = _coerce_enum(Prompt.ask("cor [QUENTE/FRIA/NEUTRA] [NEUTRA]", default="NEUTRA"))
-            hub.adicionar("LUZ", id_, nome, brilho=brilho, cor=cor.name if isinstance(cor, CorLuz) else str(cor))
+def remover_dispositivo(hub: Hub):
+    """Remove um dispositivo do hub."""
+    _listar_antes_de_escolher(hub)
+    id_ = Prompt.ask("\n[bold]ID do dispositivo a remover[/]").strip()
+    try:
+        hub.remover(id_)
+        _ok(f"Removido [cyan]{escape(id_)}[/]")
+    except Exception as e:
+        _err(f"Erro: {escape(str(e))}")
 
-        elif tipo == TipoDeDispositivo.TOMADA:
-            pot = _try_int(Prompt.ask("potencia_w (>=0) [1000]", default="1000"))
-            hub.adicionar("TOMADA", id_, nome, potencia_w=pot)
+#--------------------------------------------------------------------------------------------------------------------------------------------
+# AÇÕES DO MENU PRINCIPAL (DISPATCH POR OPÇÃO)
+#--------------------------------------------------------------------------------------------------------------------------------------------
+def _opcao_listar(hub: Hub, cfg_path: Path):
+    listar_dispositivos(hub)
 
-        elif tipo == TipoDeDispositivo.CAFETEIRA:
-            hub.adicionar("CAFETEIRA", id_, nome)
+def _opcao_mostrar(hub: Hub, cfg_path: Path):
+    disp = escolher_dispositivo(hub)
+    if disp:
+        mostrar_atributos(disp)
 
-        elif tipo == TipoDeDispositivo.RADIO:
-            vol = _try_int(Prompt.ask("volume (0-100) [0]", default="0"))
-            est = _coerce_enum(Prompt.ask("estacao (MPB/ROCK/JAZZ/...) [MPB]", default="MPB"))
-            hub.adicionar("RADIO", id_, nome,
-                          volume=vol, estacao=est.name if isinstance(est, EstacaoRadio) else str(est))
+def _opcao_comando(hub: Hub, cfg_path: Path):
+    disp = escolher_dispositivo(hub)
+    if disp:
+        executar_comando(hub, disp)
 
-        elif tipo == TipoDeDispositivo.PERSIANA:
-            ab = _try_int(Prompt.ask("abertura_inicial (0-100) [0]", default="0"))
-            hub.adicionar("PERSIANA", id_, nome, abertura=ab)
+def _opcao_atributo(hub: Hub, cfg_path: Path):
+    disp = escolher_dispositivo(hub)
+    if disp:
+        alterar_atributo(hub, disp)
 
-        console.print(Panel.fit(f"[bold green]OK[/] dispositivo [cyan]{id_}[/] adicionado.", border_style="green"))
-    except Exception as e:
-        console.print(Panel.fit(f"[red]Erro criando dispositivo:[/] {e}", border_style="red"))
+def _opcao_rotina(hub: Hub, cfg_path: Path):
+    executar_rotina_cli(hub)
 
-def remover_dispositivo(hub: Hub):
-    """Remove um dispositivo do hub."""
-    listar_dispositivos(hub)
-    id_ = Prompt.ask("\n[bold]ID do dispositivo a remover[/]").strip()
+def _opcao_relatorio(hub: Hub, cfg_path: Path):
+    gerar_relatorio(hub, cfg_path)
+
+def _opcao_salvar(hub: Hub, cfg_path: Path):
     try:
-        hub.remover(id_)
-        console.print(Panel.fit(f"[bold yellow]Removido[/] {id_}", border_style="yellow"))
+        hub.salvar_config(cfg_path)
+        _ok(f"Configuração salva em [cyan]{escape(str(cfg_path))}[/]")
     except Exception as e:
-        console.print(Panel.fit(f"[red]Erro:[/] {e}", border_style="red"))
+        _err(f"Erro salvando config: {escape(str(e))}")
+
+def _opcao_adicionar(hub: Hub, cfg_path: Path):
+    adicionar_dispositivo(hub)
+
+def _opcao_remover(hub: Hub, cfg_path: Path):
+    remover_dispositivo(hub)
+
+def _opcao_sair(hub: Hub, cfg_path: Path) -> bool:
+    if Confirm.ask("Deseja salvar a configuração antes de sair?", default=True):
+        _opcao_salvar(hub, cfg_path)
+    console.print("\n[bold green]💾 Encerrando Hub...\n\n🌟 Até mais!🌟\n[/]")
+    return True
+
+# opção digitada -> ação(hub, cfg_path); retorno True encerra o loop
+_MENU_DISPATCH: Dict[str, Callable[[Hub, Path], Optional[bool]]] = {
+    "1": _opcao_listar,
+    "2": _opcao_mostrar,
+    "3": _opcao_comando,
+    "4": _opcao_atributo,
+    "5": _opcao_rotina,
+    "6": _opcao_relatorio,
+    "7": _opcao_salvar,
+    "8": _opcao_adicionar,
+    "9": _opcao_remover,
+    "10": _opcao_sair,
+}
+# opções que geram eventos (comando, atributo, rotina, adicionar, remover)
+_OPCOES_MUTAVEIS = frozenset({"3", "4", "5", "8", "9"})
+_MENU_CHOICES = tuple(_MENU_DISPATCH)  # ("1", ..., "10"): faixa exibida no prompt
+_MENU_PROMPT = _prompt_ansi(
+    f"[bold]Selecione[/] [magenta]\\[{_MENU_CHOICES[0]}-{_MENU_CHOICES[-1]}][/] [cyan](1)[/]: "
+)
 
 #--------------------------------------------------------------------------------------------------------------------------------------------
 # MAIN CLI
 #--------------------------------------------------------------------------------------------------------------------------------------------
+def _registrar_observers(hub: Hub) -> list:
+    """Registra os observers no hub; retorna os observers CSV registrados.
+
+    Os arquivos ficam a cargo do CsvLogger (handle em cache por arquivo, fechado na saída),
+    que passa a gravar numa thread própria: comandos e rotinas não esperam pelo disco.
+    """
+    CsvLogger().iniciar_assincrono()
+    logs_dir = Path("data/logs")
+    observers_csv = [
+        CsvObserverTransitions(logs_dir / "transitions.csv"), # transições estado
+        CsvObserverEventos(logs_dir / "events.csv"),          # CSV geral(eventos)
+        CsvObserverComandos(logs_dir / "commands.csv"),       # CSV comandos
+    ]
+    hub.registrar_observer(ConsoleObserver()) # console em tempo real
+    for obs in observers_csv:
+        hub.registrar_observer(obs)
+    return observers_csv
 
 def main():
     """Função principal do CLI."""
@@ -594,76 +834,45 @@ def main():
     args = parser.parse_args()    # parse args: servem para carregar/salvar config do hub
     cfg_path = Path(args.config)  # caminho config
 
+    # rich.traceback puxa pygments: instalado só ao rodar o CLI em terminal interativo
+    # (saída redirecionada/scripts mantêm o traceback padrão, sem custo de import)
+    if console.is_terminal:
+        from rich.traceback import install as rich_traceback
+        rich_traceback(show_locals=False) # melhor rastreamento de erros (sem serializar locals)
+
     hub = Hub()                   # instância do hub
     
     # carrega config se existir; senão, defaults
     try:
         hub.carregar_config(cfg_path)
-        console.print(Panel.fit(f"[bold green]Config carregada de[/] [cyan]{cfg_path}[/]", border_style="green"))
+        _ok(f"Config carregada de [cyan]{escape(str(cfg_path))}[/]")
     except Exception:
         hub.carregar_defaults()
-        console.print(Panel.fit("[yellow]Usando configuração padrão.[/]", border_style="yellow"))
+        _aviso("Usando configuração padrão.")
 
 
-    # Observers
-    hub.registrar_observer(ConsoleObserver()) # console em tempo real
-    hub.registrar_observer(CsvObserverTransitions(Path("data/logs/transitions.csv")))  # transições estado
-    hub.registrar_observer(CsvObserverEventos(Path("data/logs/events.csv"))) # CSV geral(eventos)
-    hub.registrar_observer(CsvObserverComandos(Path("data/logs/commands.csv"))) # CSV comandos
+    # observers só são registrados na primeira ação que altera o hub (sessões só de leitura
+    # não abrem/criam os CSVs de log)
+    observers_csv: list = []
     
     header()  # cabeçalho do hub 
     
     # loop principal
-    while True:
-        mostrar_menu()
-        opcao = Prompt.ask("[bold]Selecione[/]", choices=[str(i) for i in range(1, 11)], default="1")
-
-        if opcao == "1":
-            listar_dispositivos(hub)
-
-        elif opcao == "2":
-            disp = escolher_dispositivo(hub)
-            if disp:
-                mostrar_atributos(disp)
-
-        elif opcao == "3":
-            disp = escolher_dispositivo(hub)
-            if disp:
-                executar_comando(hub, disp)
-
-        elif opcao == "4":
-            disp = escolher_dispositivo(hub)
-            if disp:
-                alterar_atributo(hub, disp)
-
-        elif opcao == "5":
-            executar_rotina_cli(hub)
-
-        elif opcao == "6":
-            gerar_relatorio(hub, cfg_path)
-
-        elif opcao == "7":
-            try:
-                hub.salvar_config(cfg_path)
-                console.print(Panel.fit(f"[bold green]Configuração salva em[/] [cyan]{cfg_path}[/]", border_style="green"))
-            except Exception as e:
-                console.print(Panel.fit(f"[red]Erro salvando config:[/] {e}", border_style="red"))
-
-        elif opcao == "8":
-            adicionar_dispositivo(hub)
-
-        elif opcao == "9":
-            remover_dispositivo(hub)
-
-        elif opcao == "10":
-            if Confirm.ask("Deseja salvar a configuração antes de sair?", default=True):
-                try:
-                    hub.salvar_config(cfg_path)
-                    console.print(Panel.fit(f"[bold green]Configuração salva em[/] [cyan]{cfg_path}[/]", border_style="green"))
-                except Exception as e:
-                    console.print(Panel.fit(f"[red]Erro salvando config:[/] {e}", border_style="red"))
-            console.print("\n[bold green]💾 Encerrando Hub...\n\n🌟 Até mais!🌟\n[/]")
-            break
+    try:
+        while True:
+            mostrar_menu()
+            opcao = _ler(_MENU_PROMPT).strip() or "1"
+            acao = _MENU_DISPATCH.get(opcao)
+            if acao is None:
+                console.print("[yellow]Opção inválida.[/]")
+                continue
+            if opcao in _OPCOES_MUTAVEIS and not observers_csv:
+                observers_csv = _registrar_observers(hub)
+            if acao(hub, cfg_path):  # True = encerrar
+                break
+    finally:
+        # sair (opção 10), Ctrl+C ou erro: grava a fila pendente e fecha os CSVs do CsvLogger
+        CsvLogger().close()
 #--------------------------------------------------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     main()
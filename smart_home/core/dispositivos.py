@@ -3,9 +3,13 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Callable
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, Mapping, Optional, Callable, Tuple
 
-from smart_home.core.eventos import Evento, TipoEvento
+from transitions import Machine
+
+from smart_home.core.eventos import TipoEvento
 #--------------------------------------------------------------------------------------------------
 # TIPOS DE DISPOSITIVOS
 #--------------------------------------------------------------------------------------------------
@@ -23,15 +27,37 @@ class TipoDeDispositivo(Enum):
     RADIO = "RADIO"
     PERSIANA = "PERSIANA"
 
+# membro -> string do tipo (value == name por construção); lookup em dict nos caminhos
+# por linha/evento em vez de resolver a propriedade `.value` do Enum a cada vez
+TIPO_STR: Dict[TipoDeDispositivo, str] = {t: t.value for t in TipoDeDispositivo}
+
+#--------------------------------------------------------------------------------------------------
+# NOME LEGÍVEL DE ESTADO
+#--------------------------------------------------------------------------------------------------
+@lru_cache(maxsize=256)
+def nome_estado(estado: Any) -> str:
+    """Converte um estado (Enum ou str) para str.
+
+    Memoizado: estados são membros de Enum (singletons) ou strings, então o
+    acerto no cache é praticamente total e evita o acesso a `.name` a cada linha.
+    """
+    return estado.name if isinstance(estado, Enum) else str(estado)
+
+# campos que alterar_atributo nunca sobrescreve
+_RESERVADOS = frozenset({"id", "nome", "tipo", "estado", "maquina", "atributos"})
+_AUSENTE = object()  # sentinela para getattr
+
 #--------------------------------------------------------------------------------------------------
 # CLASSE BASE DE DISPOSITIVO
 #--------------------------------------------------------------------------------------------------
-@dataclass
+# slots: campos comuns (id/nome/tipo/estado...) em slots; as subclasses seguem com __dict__,
+# pois a `transitions` anexa os gatilhos (ligar, is_estado_X...) em cada instância modelo
+@dataclass(slots=True)
 class DispositivoBase(ABC):
     
     """Classe base abstrata para dispositivos do Smart Home.
-    Cada dispositivo terá sua própria FSM (via `transitions`) e 
-    atributos próprios.
+    Cada dispositivo tem sua própria FSM (via `transitions`), montada a partir
+    dos estados/transições declarados na classe, e atributos próprios.
 
     Atributos:
     - id: identificador único do dispositivo, ex.: luz_sala
@@ -39,7 +65,7 @@ class DispositivoBase(ABC):
     - tipo: tipo do dispositivo (TipoDeDispositivo)
     - estado: estado atual (controlado pela FSM vinculada)
     - maquina: instância da máquina de estados (transitions.Machine)
-    - _emissor: função callback para emitir eventos (injetado pelo Hub)
+    - _emissor: callback (tipo, payload) para emitir eventos (injetado pelo Hub)
     """
     id: str
     nome: str
@@ -47,7 +73,15 @@ class DispositivoBase(ABC):
     estado: Any
     maquina: Any = field(default=None, repr=False, compare=False) # não aparece no repr/eq 
     # emissor de eventos (injetado pelo Hub)
-    _emissor: Optional[Callable[[Evento], None]] = field(default=None, repr=False, compare=False)
+    _emissor: Optional[Callable[[TipoEvento, Dict[str, Any]], None]] = field(default=None, repr=False, compare=False)
+    # comandos suportados (nome -> descrição); subclasses sobrescrevem o atributo de classe
+    _COMANDOS: ClassVar[Mapping[str, str]] = MappingProxyType({})
+    # FSM: subclasses declaram estados/transições uma vez; cada instância cria sua Machine com eles
+    _ESTADOS: ClassVar[tuple] = ()
+    _TRANSICOES: ClassVar[tuple] = ()
+    _fsm: ClassVar[Optional[Tuple[list, list]]] = None  # listas prontas, por subclasse
+    # nomes aceitos por alterar_atributo, preenchido sob demanda (um set por subclasse)
+    _gravaveis: ClassVar[Optional[set]] = None
 
     #----------------------------------------------------------------------------------------------
     # MÉTODOS ABSTRATOS - FORÇAM IMPLEMENTAÇÃO NAS SUBCLASSES
@@ -62,52 +96,92 @@ class DispositivoBase(ABC):
         """Retorna os atributos do dispositivo."""
         pass
     
+    # ----------------------------------------------------------------------------------------------
+    # FSM POR INSTÂNCIA (transitions), A PARTIR DA DEFINIÇÃO DA CLASSE
+    #----------------------------------------------------------------------------------------------
+    @classmethod
+    def _definicao_fsm(cls) -> Tuple[list, list]:
+        """Estados e transições da subclasse como listas, montadas uma única vez por classe
+        a partir de `_ESTADOS`/`_TRANSICOES` (a Machine só lê essas listas)."""
+        definicao = cls.__dict__.get("_fsm")
+        if definicao is None:
+            definicao = (list(cls._ESTADOS), [dict(t) for t in cls._TRANSICOES])
+            cls._fsm = definicao
+        return definicao
+
+    def _vincular_maquina(self, inicial: Any) -> None:
+        """Cria a Machine desta instância (modelo = o próprio dispositivo), no estado `inicial`.
+
+        Callbacks são nomes (str), resolvidos no próprio modelo.
+        """
+        estados, transicoes = self._definicao_fsm()
+        self.maquina = Machine(
+            model=self,                                   # o próprio dispositivo é o modelo
+            states=estados,                               # estados possíveis
+            transitions=transicoes,                       # transições definidas na classe
+            initial=inicial,                              # estado inicial
+            model_attribute="estado",                     # atributo que guarda o estado atual
+            send_event=True,                              # envia o evento para os callbacks
+            after_state_change="_apos_transicao",         # callback após qualquer transição
+        )
+
     # ----------------------------------------------------------------------------------------------
     # EMISSÃO DE EVENTOS (Observer/Logger)
     #----------------------------------------------------------------------------------------------
-    def set_emissor(self, emissor: Callable[[Evento], None]) -> None:
+    def set_emissor(self, emissor: Callable[[TipoEvento, Dict[str, Any]], None]) -> None:
         """Define a função callback para emitir eventos (injetado pelo Hub)."""     
         self._emissor = emissor
 
     def _emitir(self, tipo: TipoEvento, payload: dict) -> None:
-        """Emite um evento (se o emissor foi definido)."""
+        """Emite um evento (se o emissor foi definido); o Evento é montado pelo emissor."""
         if self._emissor:
-            self._emissor(Evento(tipo, payload))
+            self._emissor(tipo, payload)
 
     #----------------------------------------------------------------------------------------------
     # MÉTODOS COMPORTAMENTAIS - PODEM SER SOBRESCRITOS NAS SUBCLASSES
     #----------------------------------------------------------------------------------------------
 
-    def comandos_disponiveis(self) -> Dict[str, str]:
+    def comandos_disponiveis(self) -> Mapping[str, str]:
         """
         Opcional: lista de comandos suportados (nome -> descrição).
+        Mapeamento somente leitura, compartilhado pelas instâncias da classe.
         """
-        return {}
+        return type(self)._COMANDOS
 
     def para_dict(self) -> Dict[str, Any]:
-        """Serializa o dispositivo para JSON de configuração."""
+        """Serializa o dispositivo para JSON de configuração.
+
+        Tipo e estado saem de lookups em cache (`TIPO_STR`, `nome_estado`); os
+        atributos continuam vindo de `atributos()`, sobrescrito em toda subclasse.
+        """
         return {
             "id": self.id,
-            "tipo": self.tipo.value,
+            "tipo": TIPO_STR[self.tipo],
             "nome": self.nome,
-            "estado": self._estado_str(),
+            "estado": nome_estado(self.estado),
             "atributos": self.atributos(),
         }
 
     
     def alterar_atributo(self, chave: str, valor: Any) -> None:
-        reservados = {"id", "nome", "tipo", "estado", "maquina", "atributos"}
-        if chave in reservados:
+        if chave in _RESERVADOS:
             raise AttributeError(f"'{chave}' é reservado e não pode ser alterado.")
 
-        atual = getattr(self, chave, None)
-        if callable(atual):
-            raise AttributeError(f"'{chave}' é um método/propriedade e não pode ser sobrescrito.")
+        # nomes já validados para a classe: pula a resolução do atributo nas chamadas seguintes
+        cls = type(self)
+        gravaveis = cls.__dict__.get("_gravaveis")
+        if gravaveis is None:
+            gravaveis = cls._gravaveis = set()
+        if chave not in gravaveis:
+            # uma única resolução do atributo (sentinela distingue "não existe" de valor None)
+            atual = getattr(self, chave, _AUSENTE)
+            if atual is _AUSENTE:
+                raise AttributeError(f"Atributo '{chave}' não existe em {self.id}")
+            if callable(atual):
+                raise AttributeError(f"'{chave}' é um método/propriedade e não pode ser sobrescrito.")
+            gravaveis.add(chave)
 
-        if hasattr(self, chave):
-            setattr(self, chave, valor)
-        else:
-            raise AttributeError(f"Atributo '{chave}' não existe em {self.id}")
+        setattr(self, chave, valor)  # mantém setters de property (validação) das subclasses
 
 
     def detalhes_str(self) -> str:
@@ -116,7 +190,7 @@ class DispositivoBase(ABC):
         Returns:
             str: String formatada com id, tipo e estado.
         """
-        return f"{self.id} | {self.tipo.name} | {self._estado_str()}"
+        return f"{self.id} | {TIPO_STR[self.tipo]} | {self._estado_str()}"
 
     # ------------------------------------------------------------------
     # HELPERs PARA OBSERVER/LOGGER (PAYLOADS PADRÕES)
@@ -126,38 +200,24 @@ class DispositivoBase(ABC):
         """
         Monta payload padrão de transição de estado.
         """
-        dados = {
-            "id": self.id,
-            "tipo": self.tipo.value,
-            "evento": evento,
-            "antes": origem,
-            "depois": destino,
-        }
-        if extra:
-            dados.update(extra)
-        return dados
+        if extra:  # literal único com desempacotamento, sem dict intermediário + update
+            return {"id": self.id, "tipo": TIPO_STR[self.tipo], "evento": evento,
+                    "antes": origem, "depois": destino, **extra}
+        return {"id": self.id, "tipo": TIPO_STR[self.tipo], "evento": evento,
+                "antes": origem, "depois": destino}
 
     def evento_comando(self, comando: str, antes: str, depois: str,
                        extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Monta payload padrão para comando executado.
         """
-        dados = {
-            "id": self.id,
-            "comando": comando,
-            "antes": antes,
-            "depois": depois,
-        }
         if extra:
-            dados.update(extra)
-        return dados
+            return {"id": self.id, "comando": comando, "antes": antes, "depois": depois, **extra}
+        return {"id": self.id, "comando": comando, "antes": antes, "depois": depois}
     
     # -------------------------------------------------------------------------
     # HELPERS INTERNOS
     # -------------------------------------------------------------------------
     def _estado_str(self) -> str:
         """Converte `estado` (Enum ou str) para str."""
-        try:
-            return self.estado.name  # se for Enum
-        except AttributeError:
-            return str(self.estado)
\ No newline at end of file
+        return nome_estado(self.estado)
\ No newline at end of file
@@ -7,7 +7,12 @@ class SmartHomeError(Exception):
 	"""Base para todas as exceções do Smart Home Hub.
 
 	Aceita uma mensagem e um dict opcional de detalhes para diagnóstico.
+	As subclasses herdam este __init__ (sem um frame extra por raise).
 	"""
+	# detalhes num slot: o raise não aloca o __dict__ da exceção (o BaseException ainda expõe um,
+	# criado só se alguém o usar). Cada subclasse declara __slots__ = () para não ganhar outro.
+	__slots__ = ("detalhes",)
+
 	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
 		super().__init__(mensagem)
 		self.detalhes = detalhes
@@ -15,41 +20,34 @@ class SmartHomeError(Exception):
 
 class DispositivoJaExiste(SmartHomeError):
 	"""Tentativa de criar/adicionar um dispositivo com ID já existente."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class DispositivoNaoEncontrado(SmartHomeError):
 	"""Dispositivo referenciado não foi localizado no hub."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class ComandoInvalido(SmartHomeError):
 	"""Comando não suportado pelo dispositivo ou inválido no contexto atual."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class AtributoInvalido(SmartHomeError):
 	"""Atributo inexistente ou valor fora do intervalo permitido."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class ConfigInvalida(SmartHomeError):
 	"""Erro de configuração (JSON inválido ou entrada malformada)."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class ErroDeValidacao(SmartHomeError):
 	"""Erros de validação de comandos, atributos ou rotinas."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
+	__slots__ = ()
 
 
 class RotinaNaoEncontrada(SmartHomeError):
 	"""Rotina referenciada não foi localizada no hub."""
-	def __init__(self, mensagem: str, detalhes: dict | None = None) -> None:
-		super().__init__(mensagem, detalhes)
\ No newline at end of file
+	__slots__ = ()
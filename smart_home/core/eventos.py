@@ -2,8 +2,8 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any, Dict
-from datetime import datetime
+from typing import Any, Dict, Tuple
+import time
 #--------------------------------------------------------------------------------------------------
 # TIPOS DE EVENTOS REGISTRADOS PELO HUB E ENVIADOS AOS OBSERVERS REGISTRADOS
 #--------------------------------------------------------------------------------------------------
@@ -16,11 +16,33 @@ class TipoEvento(Enum):
     ROTINA_EXECUTADA       = auto()
     ERRO                   = auto()
 #--------------------------------------------------------------------------------------------------
+# TIMESTAMP DOS EVENTOS (resolução de segundos)
+#--------------------------------------------------------------------------------------------------
+# (segundo epoch, texto ISO) do último timestamp gerado; tupla imutável trocada numa única
+# atribuição, para que uma thread nunca leia o segundo novo com o texto antigo
+_ultimo_ts: Tuple[int, str] = (-1, "")
+
+def agora_iso() -> str:
+    """Data/hora local em ISO com resolução de segundos (ex.: 2025-09-15T10:00:00).
+
+    Eventos emitidos no mesmo segundo (rotinas, carga de config) reaproveitam o
+    texto já formatado em vez de chamar datetime.now().isoformat() a cada um.
+    """
+    global _ultimo_ts
+    seg = int(time.time())
+    ultimo = _ultimo_ts  # lido uma vez: segundo e texto sempre do mesmo par
+    if seg == ultimo[0]:
+        return ultimo[1]
+    texto = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seg))
+    _ultimo_ts = (seg, texto)
+    return texto
+
+#--------------------------------------------------------------------------------------------------
 # CLASSE DE EVENTO 
 #--------------------------------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Evento:
     tipo: TipoEvento
     payload: Dict[str, Any]
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    timestamp: str = field(default_factory=agora_iso)  # instância única repassada a todos os observers
@@ -1,6 +1,9 @@
 # smart_home/core/hub.py: gerenciamento dos dispositivos e observadores
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Any, Iterator, List, Optional
 from pathlib import Path
 from smart_home.core.eventos import Evento, TipoEvento
 from smart_home.core.observers import Observer
@@ -11,8 +14,68 @@ from smart_home.dispositivos.tomada import Tomada
 from smart_home.dispositivos.cafeteira import CafeteiraCapsulas
 from smart_home.dispositivos.radio import Radio, EstacaoRadio
 from smart_home.dispositivos.persiana import Persiana
-from smart_home.core.dispositivos import DispositivoBase
-from smart_home.core.erros import ErroDeValidacao
+from smart_home.core.dispositivos import TIPO_STR, DispositivoBase, TipoDeDispositivo, nome_estado
+from smart_home.core.erros import (
+    DispositivoJaExiste, DispositivoNaoEncontrado, ErroDeValidacao, RotinaNaoEncontrada,
+)
+#--------------------------------------------------------------------------------------------------
+# FÁBRICA POR TIPO (NOME DO TIPO -> CONSTRUTOR COM ATRIBUTOS OPCIONAIS)
+#--------------------------------------------------------------------------------------------------
+# nome (str) -> membro do Enum; os nomes possíveis são poucos, então o cache satura logo
+@lru_cache(maxsize=64)
+def _parse_cor(s: str) -> CorLuz:
+    return CorLuz[s.strip().upper()]
+
+@lru_cache(maxsize=64)
+def _parse_estacao(s: str) -> EstacaoRadio:
+    return EstacaoRadio[s.strip().upper()]
+
+def _criar_luz(id: str, nome: str, attrs: Dict[str, Any]) -> Luz:
+    brilho_inicial = int(attrs.get("brilho", attrs.get("brilho_inicial", 0)))
+    cor_val = attrs.get("cor", attrs.get("cor_inicial", CorLuz.NEUTRA))
+    if isinstance(cor_val, str):
+        cor_val = _parse_cor(cor_val)
+    return Luz(id=id, nome=nome, brilho_inicial=brilho_inicial, cor_inicial=cor_val)
+
+def _criar_radio(id: str, nome: str, attrs: Dict[str, Any]) -> Radio:
+    vol = int(attrs.get("volume", attrs.get("volume_inicial", 0)))
+    est = attrs.get("estacao", attrs.get("estacao_inicial", EstacaoRadio.MPB))
+    if isinstance(est, str):
+        est = _parse_estacao(est)
+    return Radio(id=id, nome=nome, volume_inicial=vol, estacao_inicial=est)
+
+def _criar_porta(id: str, nome: str, attrs: Dict[str, Any]) -> Porta:
+    return Porta(id=id, nome=nome)
+
+def _criar_cafeteira(id: str, nome: str, attrs: Dict[str, Any]) -> CafeteiraCapsulas:
+    return CafeteiraCapsulas(id=id, nome=nome)
+
+def _criar_tomada(id: str, nome: str, attrs: Dict[str, Any]) -> Tomada:
+    return Tomada(id=id, nome=nome, potencia_w=int(attrs.get("potencia_w", 0)))
+
+def _criar_persiana(id: str, nome: str, attrs: Dict[str, Any]) -> Persiana:
+    ab = int(attrs.get("abertura", attrs.get("abertura_inicial", 0)))
+    return Persiana(id=id, nome=nome, abertura_inicial=ab)
+
+_FABRICAS: Dict[str, Callable[[str, str, Dict[str, Any]], DispositivoBase]] = {
+    TipoDeDispositivo.PORTA.name: _criar_porta,
+    TipoDeDispositivo.LUZ.name: _criar_luz,
+    TipoDeDispositivo.TOMADA.name: _criar_tomada,
+    TipoDeDispositivo.CAFETEIRA.name: _criar_cafeteira,
+    TipoDeDispositivo.RADIO.name: _criar_radio,
+    TipoDeDispositivo.PERSIANA.name: _criar_persiana,
+}
+
+# dispositivos de Hub.carregar_defaults: (tipo, id, nome, atributos); tipo já em MAIÚSCULAS
+_DISPOSITIVOS_DEFAULT: tuple[tuple[str, str, str, Dict[str, Any]], ...] = (
+    ("PORTA", "porta_entrada", "Porta da Entrada", {}),
+    ("LUZ", "luz_sala", "Luz da Sala", {"brilho": 75, "cor": CorLuz.QUENTE}),
+    ("TOMADA", "tomada_tv", "Tomada da TV", {"potencia_w": 150}),
+    ("CAFETEIRA", "cafeteira_cozinha", "Cafeteira da Cozinha", {}),
+    ("RADIO", "radio_cozinha", "Rádio da Cozinha", {"volume": 30, "estacao": EstacaoRadio.MPB}),
+    ("PERSIANA", "persiana_quarto", "Persiana do Quarto", {"abertura": 50}),
+)
+
 #--------------------------------------------------------------------------------------------------
 # HUB (CAMADA DE SERVIÇO) - GERENCIA DISPOSITIVOS, COMANDOS, ATRIBUTOS, ROTINAS E OBSERVERS
 #--------------------------------------------------------------------------------------------------
@@ -20,47 +83,115 @@ class Hub:
     # construtor do Hub
     def __init__(self) -> None:
         self.dispositivos: Dict[str, DispositivoBase] = {}  # id -> dispositivo
-        self._observers: list[Observer] = []                # lista de observadores
+        # índice secundário: tipo -> (id -> dispositivo), mantido junto com `dispositivos`
+        self._por_tipo: Dict[TipoDeDispositivo, Dict[str, DispositivoBase]] = {}
+        # tuplas imutáveis (cópia na escrita): registrar troca a tupla; o envio itera um snapshot
+        self._observers: tuple[Observer, ...] = ()                 # observadores registrados
+        self._callbacks: tuple[Callable[[Evento], None], ...] = () # on_event já resolvido de cada observer
         self.rotinas: dict[str, list[dict]] = {}            # rotinas (nome -> lista de passos)
+        self._versao: int = 0                               # incrementa a cada mutação (cache da CLI)
+        self._lote: Optional[List[Evento]] = None           # eventos retidos em batch_events()
+
+    @property
+    def versao(self) -> int:
+        """Contador monotônico de mutações (dispositivos, estados, atributos)."""
+        return self._versao
 
     # injeta emissor em dispositivo recém criado/recuperado
     def _wire(self, disp: DispositivoBase) -> DispositivoBase:
-        disp.set_emissor(lambda evt: self._emitir(evt)) # emissor de eventos
+        disp.set_emissor(self._emitir_dispositivo) # emissor de eventos (método ligado; sem lambda intermediária)
         return disp
 
     def registrar_observer(self, obs: Observer) -> None:
         """Registra um observer para receber eventos do hub."""
-        self._observers.append(obs)
+        self._observers += (obs,)
+        self._callbacks += (obs.on_event,)  # resolve o método uma vez, não a cada evento
+
+    def _emitir_dispositivo(self, tipo: TipoEvento, payload: Dict[str, Any]) -> None:
+        """Emissor injetado nos dispositivos: monta o Evento aqui, uma vez, e entrega.
+
+        Sem observers e fora de lote, o Evento (e seu timestamp) nem chega a ser criado;
+        a entrega fica com `_emitir`.
+        """
+        if self._lote is not None or self._callbacks:  # observer registrado ou lote aberto
+            self._emitir(Evento(tipo, payload))
 
     def _emitir(self, evt: Evento) -> None:
-        """Emite um evento para todos os observers registrados."""
-        for obs in self._observers:
-            try: obs.on_event(evt)
+        """Emite um evento para todos os observers registrados (ou retém no lote aberto)."""
+        if self._lote is not None:
+            self._lote.append(evt)
+            return
+        if not self._callbacks:
+            return
+        for cb in self._callbacks:
+            try: cb(evt)  # isola cada observer (sem exceção, o try é gratuito no 3.11+ e barato no 3.10)
             except Exception: 
                 pass  # não derruba o hub
+
+    @contextmanager
+    def batch_events(self) -> Iterator[None]:
+        """Retém os eventos emitidos dentro do bloco e os entrega de uma vez na saída.
+
+        Cada observer recebe o lote via `on_events` (os CSV gravam tudo numa única escrita).
+        Blocos aninhados reaproveitam o lote do bloco mais externo.
+        """
+        if self._lote is not None:
+            yield
+            return
+        self._lote = []
+        try:
+            yield
+        finally:
+            lote, self._lote = self._lote, None
+            if lote:
+                for obs in self._observers:
+                    try: obs.on_events(lote)
+                    except Exception:
+                        pass  # não derruba o hub
  
 #--------------------------------------------------------------------------------------------------
 # CRUD DO HUB
 #--------------------------------------------------------------------------------------------------
     def adicionar(self, tipo: str, id: str, nome: str, **attrs: Any) -> DispositivoBase:
         """Adiciona um novo dispositivo ao hub."""
-        if id in self.dispositivos:
-            from smart_home.core.erros import DispositivoJaExiste
-            raise DispositivoJaExiste(f"Ja existe dispositivo com id '{id}'.")
         disp = self._criar_dispositivo(tipo, id, nome, attrs)
+        if not self._indexar(disp):
+            raise DispositivoJaExiste(f"Ja existe dispositivo com id '{id}'.")
         self._wire(disp)
-        self.dispositivos[id] = disp
-        self._emitir(Evento(TipoEvento.DISPOSITIVO_ADICIONADO, {"id": id, "tipo": tipo, "nome": nome}))
+        self._versao += 1
+        if self._lote is not None or self._callbacks:
+            self._emitir(Evento(TipoEvento.DISPOSITIVO_ADICIONADO, {"id": id, "tipo": tipo, "nome": nome}))
         return disp
 
+    def _descartar_dispositivos(self) -> None:
+        """Esvazia o hub (dict principal e índice por tipo)."""
+        self.dispositivos.clear()
+        self._por_tipo.clear()
+
+    def _indexar(self, disp: DispositivoBase) -> bool:
+        """Registra o dispositivo no dict principal e no índice por tipo.
+
+        Retorna False (sem alterar nada) se o id já estiver no hub: o `setdefault` insere ou
+        devolve o existente num único lookup. O id é internado: o dispositivo e as chaves dos
+        dicts passam a compartilhar o mesmo objeto str, e os lookups com ids internados
+        (ex.: literais) acertam por identidade.
+        """
+        disp.id = id = sys.intern(disp.id)
+        if self.dispositivos.setdefault(id, disp) is not disp:
+            return False
+        self._por_tipo.setdefault(disp.tipo, {})[id] = disp
+        return True
+
     def remover(self, id: str) -> None:
         """Remove um dispositivo do hub pelo id."""
-        if id not in self.dispositivos:
-            from smart_home.core.erros import DispositivoNaoEncontrado
+        disp = self.dispositivos.pop(id, None)  # lookup único: remove ou indica ausência
+        if disp is None:
             raise DispositivoNaoEncontrado(f"Dispositivo '{id}' nao encontrado.")
-        tipo = self.dispositivos[id].tipo.value
-        del self.dispositivos[id]
-        self._emitir(Evento(TipoEvento.DISPOSITIVO_REMOVIDO, {"id": id, "tipo": tipo}))
+        self._por_tipo[disp.tipo].pop(id, None)
+        tipo = TIPO_STR[disp.tipo]
+        self._versao += 1
+        if self._lote is not None or self._callbacks:
+            self._emitir(Evento(TipoEvento.DISPOSITIVO_REMOVIDO, {"id": id, "tipo": tipo}))
 
 #--------------------------------------------------------------------------------------------------
 # AÇÕES DO HUB 
@@ -68,18 +199,23 @@ class Hub:
     def executar_comando(self, id: str, comando: str, **kwargs: Any) -> None:
         """Executa um comando em um dispositivo do hub."""
         disp = self._exigir(id)                    #  exige o dispositivo
+        self._versao += 1                          # estado pode mudar
         disp.executar_comando(comando, **kwargs)   # delega para o dispositivo
 
 
     def alterar_atributo(self, id: str, chave: str, valor: Any) -> None:
         """Altera um atributo de um dispositivo do hub."""
         disp = self._exigir(id)               # exige o dispositivo
-        antigo = disp.atributos().get(chave)  # obtém valor antigo
+        # valor antigo só interessa ao evento: sem ninguém ouvindo, não monta o dict de atributos
+        ouvindo = self._lote is not None or self._callbacks
+        antigo = disp.atributos().get(chave) if ouvindo else None
         disp.alterar_atributo(chave, valor)   # delega para o dispositivo
-        # emite evento de atributo alterado
-        self._emitir(Evento(TipoEvento.ATRIBUTO_ALTERADO, {
-            "id": id, "atributo": chave, "antes": antigo, "depois": valor
-        }))
+        self._versao += 1
+        if ouvindo:
+            # emite evento de atributo alterado
+            self._emitir(Evento(TipoEvento.ATRIBUTO_ALTERADO, {
+                "id": id, "atributo": chave, "antes": antigo, "depois": valor
+            }))
         
         
 #--------------------------------------------------------------------------------------------------
@@ -87,13 +223,21 @@ class Hub:
 #--------------------------------------------------------------------------------------------------
     def executar_rotina(self, nome: str) -> dict:
         """Executa uma rotina predefinida, retornando um resumo dos resultados."""
+        with self.batch_events():  # eventos dos passos entregues de uma vez
+            resultados = list(self.executar_rotina_iter(nome))
+        return self.resumo_rotina(nome, resultados)
+
+    def executar_rotina_iter(self, nome: str) -> Iterator[dict]:
+        """Executa uma rotina passo a passo, produzindo o resultado de cada passo.
+
+        Ao final (gerador esgotado) emite o evento ROTINA_EXECUTADA com o resumo.
+        """
         passos = self.rotinas.get(nome) # obtém passos da rotina
         if not passos:
-            from smart_home.core.erros import RotinaNaoEncontrada
             raise RotinaNaoEncontrada(f"Rotina '{nome}' nao encontrada.", detalhes={"nome": nome})
 
         resultados = []
-        ok = 0
+        dispositivos = self.dispositivos  # lookups locais no laço (sem _exigir por passo)
         # itera sobre os passos da rotina
         for i, passo in enumerate(passos, 1):
             pid = passo.get("id")
@@ -104,20 +248,28 @@ class Hub:
                 args = passo.get("args", {})
             args = args or {}
             try:
-                disp = self._exigir(pid)
-                antes = getattr(disp.estado, "name", str(disp.estado))
+                disp = dispositivos.get(pid)
+                if disp is None:
+                    raise DispositivoNaoEncontrado(f"Dispositivo '{pid}' nao encontrado.")
+                self._versao += 1
+                antes = nome_estado(disp.estado)
                 disp.executar_comando(cmd, **args)
-                depois = getattr(disp.estado, "name", str(disp.estado))
-                resultados.append({"passo": i, "id": pid, "cmd": cmd, "ok": True, "antes": antes, "depois": depois})
-                ok += 1
+                depois = nome_estado(disp.estado)
+                r = {"passo": i, "id": pid, "cmd": cmd, "ok": True, "antes": antes, "depois": depois}
             except Exception as e:
-                resultados.append({"passo": i, "id": pid, "cmd": cmd, "ok": False, "erro": str(e)})
+                r = {"passo": i, "id": pid, "cmd": cmd, "ok": False, "erro": str(e)}
+            resultados.append(r)
+            yield r
 
-        resumo = {"rotina": nome, "total": len(passos), "sucesso": ok, "falha": len(passos)-ok, "resultados": resultados}
         # emite um evento “macro” (útil p/ CSV geral)
-        from smart_home.core.eventos import Evento, TipoEvento
-        self._emitir(Evento(TipoEvento.ROTINA_EXECUTADA, resumo))
-        return resumo
+        if self._lote is not None or self._callbacks:
+            self._emitir(Evento(TipoEvento.ROTINA_EXECUTADA, self.resumo_rotina(nome, resultados)))
+
+    @staticmethod
+    def resumo_rotina(nome: str, resultados: List[dict]) -> dict:
+        """Monta o resumo (totais + resultados) de uma execução de rotina."""
+        ok = sum(1 for r in resultados if r["ok"])
+        return {"rotina": nome, "total": len(resultados), "sucesso": ok, "falha": len(resultados)-ok, "resultados": resultados}
 
         
 #--------------------------------------------------------------------------------------------------
@@ -129,49 +281,43 @@ class Hub:
                            nome: str, 
                            attrs: Dict[str, Any]) -> DispositivoBase:
         """ Fábrica de dispositivos. Leva em conta os atributos opcionais de cada tipo."""
-        t = tipo.strip().upper() # tipo em maiúsculas
-        # tentaR instanciar conforme tipo
-        if t == "PORTA":
-            return Porta(id=id, nome=nome)
-        if t == "LUZ":
-            brilho_inicial = int(attrs.get("brilho", attrs.get("brilho_inicial", 0)))
-            cor_val = attrs.get("cor", attrs.get("cor_inicial", CorLuz.NEUTRA))
-            if isinstance(cor_val, str):
-                cor_val = CorLuz[cor_val.strip().upper()]
-            return Luz(id=id, nome=nome, brilho_inicial=brilho_inicial, cor_inicial=cor_val)
-        if t == "TOMADA":
-            pot = int(attrs.get("potencia_w", 0))
-            return Tomada(id=id, nome=nome, potencia_w=pot)
-        if t == "CAFETEIRA":
-            return CafeteiraCapsulas(id=id, nome=nome)
-        if t == "RADIO":
-            vol = int(attrs.get("volume", attrs.get("volume_inicial", 0)))
-            est = attrs.get("estacao", attrs.get("estacao_inicial", EstacaoRadio.MPB))
-            if isinstance(est, str):
-                est = EstacaoRadio[est.strip().upper()]
-            return Radio(id=id, nome=nome, volume_inicial=vol, estacao_inicial=est)
-        if t == "PERSIANA":
-            ab = int(attrs.get("abertura", attrs.get("abertura_inicial", 0)))
-            return Persiana(id=id, nome=nome, abertura_inicial=ab)
-        # tipo não reconhecido
-        raise ErroDeValidacao(f"Tipo de dispositivo nao suportado: {t}", detalhes={"tipo": t})
+        fabrica = _FABRICAS.get(tipo)  # caminho comum (JSON/CLI): tipo já canônico, sem normalizar
+        if fabrica is None:
+            t = tipo.strip().upper() # tipo em maiúsculas
+            fabrica = _FABRICAS.get(t)
+            if fabrica is None:
+                # tipo não reconhecido
+                raise ErroDeValidacao(f"Tipo de dispositivo nao suportado: {t}", detalhes={"tipo": t})
+        return fabrica(id, nome, attrs)
 
 #--------------------------------------------------------------------------------------------------
 # CONSULTAS DO HUB 
 #--------------------------------------------------------------------------------------------------
     def listar(self) -> List[DispositivoBase]:
-        """Lista todos os dispositivos do hub."""
+        """Lista todos os dispositivos do hub.
+
+        Devolve uma lista nova (cópia) a cada chamada; quem só itera pode usar
+        `hub.dispositivos.values()` (view, sem alocação), como faz o salvamento do config.
+        """
         return list(self.dispositivos.values())
 
+    def listar_por_tipo(self, tipo: TipoDeDispositivo) -> List[DispositivoBase]:
+        """Lista os dispositivos de um tipo (via índice, sem varrer todos os dispositivos)."""
+        por_id = self._por_tipo.get(tipo)
+        return list(por_id.values()) if por_id else []
+
+    def __len__(self) -> int:
+        """Quantidade de dispositivos no hub (sem materializar a lista)."""
+        return len(self.dispositivos)
+
     def obter(self, id: str) -> Optional[DispositivoBase]:
         """Obtém um dispositivo pelo ID."""
         return self.dispositivos.get(id)
 
     def _exigir(self, id: str) -> DispositivoBase:
         """Obtém um dispositivo pelo ID, ou lança erro se não existir."""
-        disp = self.obter(id)
-        if not disp:
-            from smart_home.core.erros import DispositivoNaoEncontrado
+        disp = self.dispositivos.get(id)
+        if disp is None:
             raise DispositivoNaoEncontrado(f"Dispositivo '{id}' nao encontrado.")
         return disp
 
@@ -195,11 +341,17 @@ class Hub:
         resultado = carregar_config_hub(Path(caminho))
         dispositivos = resultado.get("dispositivos", {})
         rotinas = resultado.get("rotinas", {})
-        self.dispositivos.clear()
+        self._descartar_dispositivos()
+        self._versao += 1
         for disp in dispositivos.values():
             self._wire(disp)
-            self.dispositivos[disp.id] = disp
-        # rotinas já normalizadas
+            self._indexar(disp)
+        # rotinas já normalizadas; ids dos passos internados como os dos dispositivos
+        for passos in rotinas.values():
+            for passo in passos:
+                pid = passo.get("id") if isinstance(passo, dict) else None
+                if isinstance(pid, str):
+                    passo["id"] = sys.intern(pid)
         self.rotinas = rotinas
 
 #--------------------------------------------------------------------------------------------------
@@ -207,12 +359,9 @@ class Hub:
 #--------------------------------------------------------------------------------------------------
     def carregar_defaults(self) -> None:
         """Carrega uma configuração default, com alguns dispositivos."""
-        self.dispositivos.clear()
-        # use tipo em MAIÚSCULAS, pois _criar_dispositivo faz t.upper()
-        self.adicionar("PORTA", "porta_entrada", "Porta da Entrada")
-        self.adicionar("LUZ", "luz_sala", "Luz da Sala", brilho=75, cor=CorLuz.QUENTE)
-        self.adicionar("TOMADA", "tomada_tv", "Tomada da TV", potencia_w=150)
-        self.adicionar("CAFETEIRA", "cafeteira_cozinha", "Cafeteira da Cozinha")
-        self.adicionar("RADIO", "radio_cozinha", "Rádio da Cozinha", volume=30, estacao=EstacaoRadio.MPB)
-        self.adicionar("PERSIANA", "persiana_quarto", "Persiana do Quarto", abertura=50)
+        self._descartar_dispositivos()
+        self._versao += 1
+        with self.batch_events():  # eventos DISPOSITIVO_ADICIONADO entregues de uma vez
+            for tipo, id, nome, attrs in _DISPOSITIVOS_DEFAULT:
+                self.adicionar(tipo, id, nome, **attrs)
 
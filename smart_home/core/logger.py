@@ -1,44 +1,178 @@
 # smart_home/core/logger.py: singleton para logging CSV
 from __future__ import annotations
+import atexit
 import csv
+import queue
 from pathlib import Path
-from threading import Lock
-from typing import Iterable, Mapping, Any
+from threading import Lock, Thread
+from typing import Dict, Iterable, List, Mapping, Any, Sequence, TextIO, Tuple
+
+_BUFFER_BYTES = 64 * 1024  # buffer de escrita por arquivo
+_FILA_MAX = 10_000         # modo assíncrono: itens pendentes antes de bloquear quem escreve
+_LOTE_MAX = 256            # modo assíncrono: itens agrupados por rodada da thread escritora
 #--------------------------------------------------------------------------------------------------
 # LOGGER CSV (SINGLETON) PARA ESCRITA DE LINHAS EM CSV EVITANDO CONCORRÊNCIA
 #--------------------------------------------------------------------------------------------------
 
 class CsvLogger:
-    """Singleton para escrever linhas em CSV (com cabeçalho automático)."""
+    """Singleton para escrever linhas em CSV (com cabeçalho automático).
+
+    `write_row`/`write_rows` recebem dicts; `write_row_seq`/`write_rows_seq` recebem tuplas já
+    na ordem de `headers` (caminho dos observers, sem o mapeamento dict -> lista por linha).
+    Tudo é gravado por `csv.writer`.
+    Mantém um handle aberto por arquivo (com seu writer): depois da primeira escrita,
+    cada chamada é só `writerows` + `flush` (sem mkdir/exists/open/close por evento).
+    Os handles são fechados em `close()` ou na saída do processo (atexit).
+
+    Opcionalmente (`iniciar_assincrono()`), as escritas vão para uma fila limitada consumida
+    por uma thread própria: quem emite eventos não espera pelo disco. Nesse modo, quem for
+    ler os CSVs deve chamar `flush()` antes (espera a fila esvaziar).
+    """
     _instance: "CsvLogger | None" = None
     _lock = Lock()
 
     def __new__(cls) -> "CsvLogger":
         """Garante que só haja uma instância (singleton thread-safe). """
-        with cls._lock:
+        instancia = cls._instance
+        if instancia is not None:  # caminho rápido: já criada, sem tomar o lock
+            return instancia
+        with cls._lock:  # dupla checagem: outra thread pode ter criado enquanto esperávamos
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
-                # armazena quais arquivos já tiveram cabeçalho escrito nesta execução
-                cls._instance._file_headers_written = set()  # type: ignore[attr-defined]
+                # path -> (arquivo aberto, writer, cabeçalho usado)
+                cls._instance._handles = {}  # type: ignore[attr-defined]
+                # modo assíncrono: fila e thread escritora (None = síncrono); o lock da fila
+                # garante que nada seja enfileirado depois da sentinela de parada
+                cls._instance._fila = None        # type: ignore[attr-defined]
+                cls._instance._thread = None      # type: ignore[attr-defined]
+                cls._instance._lock_fila = Lock() # type: ignore[attr-defined]
+                atexit.register(cls._instance.close)
             return cls._instance
 
+    def _handle(self, p: Path, headers: Tuple[str, ...]) -> Tuple[TextIO, Any]:
+        """Handle/writer em cache para `p`; abre (e escreve o cabeçalho) na primeira vez.
+        Se o cabeçalho pedido mudar para o mesmo arquivo, reabre com o novo."""
+        atual = self._handles.get(p)
+        if atual is not None:
+            f, writer, hdr = atual
+            if hdr == headers:
+                return f, writer
+            f.close()
+        p.parent.mkdir(parents=True, exist_ok=True)
+        f = p.open("a", newline="", encoding="utf-8", buffering=_BUFFER_BYTES)
+        writer = csv.writer(f)
+        if f.tell() == 0:  # arquivo novo/vazio: cabeçalho
+            writer.writerow(headers)
+        self._handles[p] = (f, writer, headers)
+        return f, writer
+
     def write_row(self, path: Path | str, headers: Iterable[str], row: Mapping[str, Any]) -> None:
         """Escreve uma linha em CSV, criando o arquivo e escrevendo o cabeçalho se necessário."""
-        p = Path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
+        self.write_rows(path, headers, (row,))
 
-        headers = list(headers)
-        write_header = p not in self._file_headers_written and not p.exists()
+    def write_rows(self, path: Path | str, headers: Iterable[str], rows: Iterable[Mapping[str, Any]]) -> None:
+        """Escreve múltiplas linhas (dicts) em CSV, criando o arquivo e escrevendo o cabeçalho
+        se necessário. Como no DictWriter: chaves ausentes viram vazio, chaves fora de
+        `headers` são ignoradas."""
+        headers = tuple(headers)
+        self.write_rows_seq(path, headers, [tuple(r.get(h, "") for h in headers) for r in rows])
 
-        with p.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
-            if write_header:
-                writer.writeheader()
-                self._file_headers_written.add(p)
-            writer.writerow(row)
+    def write_row_seq(self, path: Path | str, headers: Iterable[str], row: Sequence[Any]) -> None:
+        """Como `write_row`, mas a linha já vem como tupla/lista na ordem de `headers`."""
+        self.write_rows_seq(path, headers, (row,))
 
-    def write_rows(self, path: Path | str, headers: Iterable[str], rows: Iterable[Mapping[str, Any]]) -> None:
-        """Escreve múltiplas linhas em CSV, criando o arquivo e escrevendo o cabeçalho se necessário."""
-        for r in rows:
-            self.write_row(path, headers, r)
-    
\ No newline at end of file
+    def write_rows_seq(self, path: Path | str, headers: Iterable[str], rows: Iterable[Sequence[Any]]) -> None:
+        """Escreve múltiplas linhas (tuplas na ordem de `headers`) num único write no handle em
+        cache, criando o arquivo e escrevendo o cabeçalho se necessário.
+
+        O buffer é descarregado ao final de cada chamada: quem lê o CSV logo depois
+        (ex.: relatórios) vê as linhas, como quando o arquivo era aberto/fechado por evento.
+        No modo assíncrono a chamada só enfileira; as linhas ficam visíveis após `flush()`.
+        """
+        p = path if isinstance(path, Path) else Path(path)
+        if self._fila is not None:  # modo assíncrono: a thread escritora grava
+            with self._lock_fila:
+                fila = self._fila  # relido sob o lock: close() pode ter voltado ao modo síncrono
+                if fila is not None:
+                    fila.put((p, tuple(headers), list(rows)))
+                    return
+        self._gravar(p, tuple(headers), rows)
+
+    def _gravar(self, p: Path, headers: Tuple[str, ...], rows: Iterable[Sequence[Any]]) -> None:
+        with self._lock:
+            f, writer = self._handle(p, headers)
+            writer.writerows(rows)
+            f.flush()
+
+    #----------------------------------------------------------------------------------------------
+    # MODO ASSÍNCRONO (THREAD ESCRITORA + FILA LIMITADA)
+    #----------------------------------------------------------------------------------------------
+    def iniciar_assincrono(self) -> None:
+        """Passa a gravar numa thread dedicada (idempotente); `close()` volta ao modo síncrono."""
+        with self._lock_fila:
+            if self._fila is not None:
+                return
+            fila: queue.Queue = queue.Queue(maxsize=_FILA_MAX)
+            self._thread = Thread(target=self._drenar, args=(fila,), name="csv-logger", daemon=True)
+            self._thread.start()
+            self._fila = fila
+
+    def _drenar(self, fila: queue.Queue) -> None:
+        """Laço da thread escritora: junta até `_LOTE_MAX` itens pendentes, agrupa por arquivo
+        e grava cada grupo com um único writerows (ordem preservada dentro de cada arquivo).
+
+        Cada grupo é gravado isoladamente: a falha em um arquivo não descarta os demais.
+        """
+        while True:
+            itens = [fila.get()]
+            while len(itens) < _LOTE_MAX:
+                try:
+                    itens.append(fila.get_nowait())
+                except queue.Empty:
+                    break
+            grupos: Dict[Tuple[Path, Tuple[str, ...]], List[Sequence[Any]]] = {}
+            fim = False
+            for item in itens:
+                if item is None:  # sentinela de close(): sempre o último item enfileirado
+                    fim = True
+                    continue
+                p, headers, rows = item
+                grupos.setdefault((p, headers), []).extend(rows)
+            for (p, headers), rows in grupos.items():
+                try:
+                    self._gravar(p, headers, rows)
+                except Exception:
+                    pass  # não derruba a thread nem os outros arquivos (mesma política do hub)
+            for _ in itens:
+                fila.task_done()
+            if fim:
+                return
+
+    def _parar_assincrono(self) -> None:
+        """Grava o que estiver na fila, encerra a thread escritora e volta ao modo síncrono."""
+        with self._lock_fila:
+            fila, thread = self._fila, self._thread
+            if fila is None or thread is None:
+                return
+            self._fila = self._thread = None  # escritas seguintes já são síncronas
+            fila.put(None)
+        thread.join()
+
+    def flush(self) -> None:
+        """Descarrega os buffers de todos os arquivos abertos (no modo assíncrono, antes
+        espera a fila esvaziar)."""
+        fila = self._fila
+        if fila is not None:
+            fila.join()
+        with self._lock:
+            for f, _, _ in self._handles.values():
+                f.flush()
+
+    def close(self) -> None:
+        """Fecha todos os arquivos abertos (reabertos sob demanda na próxima escrita).
+        No modo assíncrono, antes grava a fila e encerra a thread escritora."""
+        self._parar_assincrono()
+        with self._lock:
+            for f, _, _ in self._handles.values():
+                f.close()
+            self._handles.clear()
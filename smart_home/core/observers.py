@@ -2,9 +2,11 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Iterable, List, Optional, Tuple
 from smart_home.core.eventos import Evento, TipoEvento
 from smart_home.core.logger import CsvLogger
+
+_csv_logger = CsvLogger()  # singleton resolvido uma vez (sem passar por __new__ a cada evento)
 #--------------------------------------------------------------------------------------------------
 # CLASSE BASE PARA OBSERVERS (PADRÃO OBSERVER)
 #--------------------------------------------------------------------------------------------------
@@ -13,10 +15,46 @@ class Observer(ABC):
     def on_event(self, evt: Evento) -> None:
         pass
 
+    def on_events(self, evts: List[Evento]) -> None:
+        """Recebe um lote de eventos (ver `Hub.batch_events`); padrão: um a um."""
+        for evt in evts:
+            self.on_event(evt)
+
+#--------------------------------------------------------------------------------------------------
+# BASE DOS OBSERVERS CSV (GRAVAÇÃO VIA CsvLogger)
+#--------------------------------------------------------------------------------------------------
+class CsvObserverBase(Observer):
+    """Base para observers que gravam linhas em CSV.
+
+    Toda escrita passa pelo `CsvLogger`, que mantém um handle (com buffer) por arquivo e
+    descarrega ao fim de cada escrita; abrir/fechar os arquivos é responsabilidade dele.
+
+    Subclasses implementam `_linha(evt)`, que monta a linha CSV como tupla na ordem de
+    `headers` (ou None para ignorar o evento).
+    """
+    def __init__(self, path: str | Path, headers: Iterable[str]) -> None:
+        self.path = Path(path)
+        self.headers = tuple(headers)
+
+    @abstractmethod
+    def _linha(self, evt: Evento) -> Optional[Tuple[Any, ...]]:
+        """Monta a linha CSV do evento; None se o evento não interessa a este observer."""
+
+    def on_event(self, evt: Evento) -> None:
+        row = self._linha(evt)
+        if row is not None:
+            _csv_logger.write_rows_seq(self.path, self.headers, (row,))
+
+    def on_events(self, evts: List[Evento]) -> None:
+        """Grava o lote inteiro numa única escrita no CsvLogger."""
+        rows = [row for row in map(self._linha, evts) if row is not None]
+        if rows:
+            _csv_logger.write_rows_seq(self.path, self.headers, rows)
+
 #--------------------------------------------------------------------------------------------------
 #  OBSERVER PARA GRAVAR TRANSIÇÕES DE ESTADO EM CSV
 #--------------------------------------------------------------------------------------------------
-class CsvObserverTransitions(Observer):
+class CsvObserverTransitions(CsvObserverBase):
     """
     Escreve as transições de estado em CSV com as colunas do enunciado:
     timestamp,id_dispositivo,evento,estado_origem,estado_destino
@@ -25,21 +63,20 @@ class CsvObserverTransitions(Observer):
 
     def __init__(self, path: Path) -> None:
         """Inicializa o observer com o caminho do arquivo CSV destino. """
-        self.path = Path(path)
+        super().__init__(path, self.HEADERS)
 
-    def on_event(self, evt: Evento) -> None:
+    def _linha(self, evt: Evento) -> Optional[Tuple[Any, ...]]:
         """Registra somente eventos de transição de estado (TRANSICAO_ESTADO)."""
-        if evt.tipo != TipoEvento.TRANSICAO_ESTADO:
-            return
+        if evt.tipo is not TipoEvento.TRANSICAO_ESTADO:
+            return None
         p = evt.payload
-        row = {
-            "timestamp": evt.timestamp,
-            "id_dispositivo": p.get("id", ""),
-            "evento": str(p.get("evento", "")).lower(),
-            "estado_origem": str(p.get("antes", "")).lower(),
-            "estado_destino": str(p.get("depois", "")).lower(),
-        }
-        CsvLogger().write_row(self.path, self.HEADERS, row)
+        return (
+            evt.timestamp,
+            p.get("id", ""),
+            str(p.get("evento", "")).lower(),
+            str(p.get("antes", "")).lower(),
+            str(p.get("depois", "")).lower(),
+        )
 
 #--------------------------------------------------------------------------------------------------
 # OBSERVER SIMPLES DE CONSOLE
@@ -53,48 +90,33 @@ class ConsoleObserver(Observer):
 #--------------------------------------------------------------------------------------------------
 # OBSERVER PARA GRAVAR COMANDOS EXECUTADOS EM CSV
 #--------------------------------------------------------------------------------------------------
-class CsvObserverComandos(Observer):
+class CsvObserverComandos(CsvObserverBase):
     """Grava somente comandos executados (COMANDO_EXECUTADO) em CSV.
 
     Formato: timestamp,id_dispositivo,comando,estado_origem,estado_destino
     Útil para análises adicionais separadas das transições reais.
     """
     def __init__(self, path_csv: str | Path) -> None:
-        self.path = Path(path_csv)
-        self.headers = ["timestamp", "id_dispositivo", "comando", "estado_origem", "estado_destino"]
-        self.logger = CsvLogger()
+        super().__init__(path_csv, ["timestamp", "id_dispositivo", "comando", "estado_origem", "estado_destino"])
 
-    def on_event(self, evt: Evento) -> None:
+    def _linha(self, evt: Evento) -> Optional[Tuple[Any, ...]]:
         """Registra somente eventos de comando executado (COMANDO_EXECUTADO)."""
         if evt.tipo is not TipoEvento.COMANDO_EXECUTADO:
-            return
+            return None
         p = evt.payload
-        row = {
-            "timestamp": evt.timestamp,
-            "id_dispositivo": p.get("id"),
-            "comando": p.get("comando"),
-            "estado_origem": p.get("antes"),
-            "estado_destino": p.get("depois"),
-        }
-        self.logger.write_row(self.path, self.headers, row)
+        return (evt.timestamp, p.get("id"), p.get("comando"), p.get("antes"), p.get("depois"))
 
 #--------------------------------------------------------------------------------------------------
 # OBSERVER PARA GRAVAR TODOS OS EVENTOS EM CSV
 #--------------------------------------------------------------------------------------------------
-class CsvObserverEventos(Observer):
+class CsvObserverEventos(CsvObserverBase):
     """Grava os eventos num CSV geral."""
     def __init__(self, path_csv: str | Path) -> None:
-        self.path = Path(path_csv)
-        self.headers = ["timestamp", "tipo", "id", "extra"]
-        self.logger = CsvLogger()
+        super().__init__(path_csv, ["timestamp", "tipo", "id", "extra"])
 
-    def on_event(self, evt: Evento) -> None:
+    def _linha(self, evt: Evento) -> Optional[Tuple[Any, ...]]:
         """Registra todos os eventos."""
         p = evt.payload 
-        row = {
-            "timestamp": evt.timestamp,
-            "tipo": evt.tipo.name,
-            "id": p.get("id"),
-            "extra": {k: v for k, v in p.items() if k != "id"},
-        }
-        self.logger.write_row(self.path, self.headers, row)
+        extra = p.copy()  # cópia em C + pop: mesma ordem/saída da compreensão que filtrava "id"
+        id_ = extra.pop("id", None)
+        return (evt.timestamp, evt.tipo.name, id_, extra)
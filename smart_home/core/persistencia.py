@@ -1,16 +1,22 @@
 # smart_home/core/persistencia.py: salvar e carregar configuração do hub em JSON
 from __future__ import annotations
-import json
+import os
+import stat
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from enum import Enum
+from typing import BinaryIO, Callable, Dict, Any, Tuple, Type, TypeVar
 from smart_home.dispositivos.porta import Porta
 from smart_home.dispositivos.luz import Luz, CorLuz
 from smart_home.dispositivos.tomada import Tomada
 from smart_home.dispositivos.cafeteira import CafeteiraCapsulas
 from smart_home.dispositivos.radio import Radio, EstacaoRadio
 from smart_home.dispositivos.persiana import Persiana
-from smart_home.core.dispositivos import TipoDeDispositivo, DispositivoBase
+from smart_home.core.dispositivos import TIPO_STR, TipoDeDispositivo, DispositivoBase
 from smart_home.core.erros import ConfigInvalida
+from smart_home.core import _json
+
+E = TypeVar("E", bound=Enum)  # enums de atributos (CorLuz, EstacaoRadio)
 #--------------------------------------------------------------------------------------------------
 # DEFAULTS DE DISPOSITIVOS (USADOS SE NÃO HOUVER ARQUIVO DE CONFIGURAÇÃO CONFIG.JSON)
 #--------------------------------------------------------------------------------------------------
@@ -26,52 +32,150 @@ def criar_dispositivos_default() -> Dict[str, Any]:
         "tomada_cozinha": Tomada(id="tomada_cozinha", nome="Tomada da Cozinha", potencia_w=500),
     }
 
-def _estado_str(estado) -> str:
-    """ Retorna representação string do estado (enum ou outro).
-    Usado para salvar estado em formato legível. """
-    return getattr(estado, "name", str(estado))
-
 
 #--------------------------------------------------------------------------------------------------
 # FUNÇÕES PARA SALVAR E CARREGAR CONFIGURAÇÃO DO HUB EM JSON 
 #--------------------------------------------------------------------------------------------------
 
-def _dispositivo_para_dict(d: DispositivoBase) -> dict:
-    """ Converte um dispositivo em dict serializável para JSON.
-    Inclui somente atributos "essenciais" (id, tipo, nome, estado, atributos).
+# cabeçalho fixo do config.json (só lido na serialização)
+_CABECALHO_HUB = {"nome": "Casa Inteligente", "versao": "1.0"}
+
+def _snapshot_config(hub) -> Dict[str, Any]:
+    """Monta, numa passada, a estrutura completa do config.json a partir do hub.
+
+    Cada dispositivo vira dict via `DispositivoBase.para_dict` (id, tipo, nome, estado,
+    atributos), iterando direto o dict do hub, sem a cópia em lista de `listar()`.
     """
     return {
-        "id": d.id,
-        "tipo": d.tipo.value,
-        "nome": d.nome,
-        "estado": getattr(d.estado, "name", str(d.estado)),
-        "atributos": d.atributos(),
+        "hub": _CABECALHO_HUB,
+        "dispositivos": [d.para_dict() for d in hub.dispositivos.values()], # lista de dicts de dispositivos
+        "rotinas": hub.rotinas, # dict de rotinas
     }
 
+# acima disso, o config é gravado dispositivo a dispositivo (memória limitada a um por vez)
+LIMITE_CONFIG_STREAM = 1000
+
+def _indentado(obj: Any, nivel: int) -> bytes:
+    """JSON de `obj` com 2 espaços, deslocado `nivel` níveis (como se aninhado no documento).
+    Strings JSON não têm quebra de linha literal, então todo b"\\n" é de formatação."""
+    return _json.dumps(obj, indent=True).replace(b"\n", b"\n" + b"  " * nivel)
+
+def _salvar_config_stream(f: BinaryIO, hub) -> None:
+    """Grava o config.json em partes: cada dispositivo é serializado e escrito em sequência.
+
+    O pico de memória fica no tamanho de um dispositivo (não do documento inteiro).
+    A saída é byte a byte a mesma de `_json.dumps(_snapshot_config(hub), indent=True)`.
+    """
+    f.write(b'{\n  "hub": ' + _indentado(_CABECALHO_HUB, 1) + b',\n  "dispositivos": [')
+    vazio = True
+    for d in hub.dispositivos.values():
+        f.write((b"\n    " if vazio else b",\n    ") + _indentado(d.para_dict(), 2))
+        vazio = False
+    f.write((b"]" if vazio else b"\n  ]") + b',\n  "rotinas": ' + _indentado(hub.rotinas, 1) + b"\n}")
+
+def _modo_destino(path: Path) -> int:
+    """Permissões que o arquivo final deve ter: as do destino atual, ou (arquivo novo) as que
+    um `open()` comum daria, 0o666 menos a umask (o mkstemp cria com 0o600)."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)  # a umask só pode ser lida trocando-a; restaura em seguida
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def _gravar_atomico(path: Path, escrever: Callable[[BinaryIO], None]) -> None:
+    """Escreve num arquivo temporário do mesmo diretório e o troca pelo destino com
+    `os.replace`: uma falha no meio da escrita nunca corrompe o config existente.
+    O arquivo trocado mantém as permissões do destino (ou as padrão, se for novo)."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            f = os.fdopen(fd, "wb")
+        except BaseException:
+            os.close(fd)  # fdopen falhou: o descritor ainda é nosso
+            raise
+        with f:
+            escrever(f)
+        os.chmod(tmp, _modo_destino(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
 def salvar_config_hub(path: Path, hub) -> None:
-    """Salva configuração completa do hub.
+    """Salva configuração completa do hub (JSON UTF-8, 2 espaços; orjson se disponível).
 
     Args:
         path: Caminho destino.
-        hub: Instância de Hub (duck-typed: precisa de listar() e rotinas).
+        hub: Instância de Hub (duck-typed: precisa de `dispositivos` (id -> dispositivo) e `rotinas`).
     """
-    # criar dict de configuração
-    data = {
-        "hub": {"nome": "Casa Inteligente", "versao": "1.0"},
-        "dispositivos": [_dispositivo_para_dict(d) for d in hub.listar()], # lista de dicts de dispositivos 
-        "rotinas": hub.rotinas, # dict de rotinas
-    }
     # garantir que o diretório existe
     path.parent.mkdir(parents=True, exist_ok=True) 
-    # salvar em JSON a configuração
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8") 
+    if len(hub.dispositivos) > LIMITE_CONFIG_STREAM:
+        _gravar_atomico(path, lambda f: _salvar_config_stream(f, hub))
+        return
+    # documento inteiro serializado numa única escrita
+    dados = _json.dumps(_snapshot_config(hub), indent=True)
+    _gravar_atomico(path, lambda f: f.write(dados))
+
+
+def _enum_por_nome(valor: Any, enum_cls: Type[E], default: E) -> E:
+    """Converte nome (str) em membro de `enum_cls`; nome desconhecido vira `default`.
+    Valores que não são str (ex.: o próprio membro) passam direto."""
+    if isinstance(valor, str):
+        return enum_cls.__members__.get(valor.strip().upper(), default)
+    return valor
+
+def _instanciar_luz(id_: str, nome: str, attrs: dict) -> Luz:
+    brilho = int(attrs.get("brilho", attrs.get("brilho_inicial", 0)))
+    cor = _enum_por_nome(attrs.get("cor", attrs.get("cor_inicial", CorLuz.NEUTRA)), CorLuz, CorLuz.NEUTRA)
+    return Luz(id=id_, nome=nome, brilho_inicial=brilho, cor_inicial=cor)
+
+def _instanciar_tomada(id_: str, nome: str, attrs: dict) -> Tomada:
+    return Tomada(id=id_, nome=nome, potencia_w=int(attrs.get("potencia_w", 0)))
+
+def _instanciar_radio(id_: str, nome: str, attrs: dict) -> Radio:
+    vol = int(attrs.get("volume", attrs.get("volume_inicial", 0)))
+    est = _enum_por_nome(attrs.get("estacao", attrs.get("estacao_inicial", EstacaoRadio.MPB)),
+                         EstacaoRadio, EstacaoRadio.MPB)
+    return Radio(id=id_, nome=nome, volume_inicial=vol, estacao_inicial=est)
 
+def _instanciar_persiana(id_: str, nome: str, attrs: dict) -> Persiana:
+    ab = int(attrs.get("abertura", attrs.get("abertura_inicial", 0)))
+    return Persiana(id=id_, nome=nome, abertura_inicial=ab)
+
+# registro: nome do tipo (JSON) -> construtor a partir de (id, nome, atributos)
+_INSTANCIADORES: Dict[str, Callable[[str, str, dict], DispositivoBase]] = {
+    TipoDeDispositivo.PORTA.name: lambda id_, nome, attrs: Porta(id=id_, nome=nome),
+    TipoDeDispositivo.LUZ.name: _instanciar_luz,
+    TipoDeDispositivo.TOMADA.name: _instanciar_tomada,
+    TipoDeDispositivo.CAFETEIRA.name: lambda id_, nome, attrs: CafeteiraCapsulas(id=id_, nome=nome),
+    TipoDeDispositivo.RADIO.name: _instanciar_radio,
+    TipoDeDispositivo.PERSIANA.name: _instanciar_persiana,
+}
+
+# atributos do JSON que a carga NÃO reaplica via alterar_atributo: os derivados/somente leitura
+# (gravados só para consulta) e os já consumidos pelo construtor do tipo. Montados uma vez aqui,
+# em vez de descobrir a cada carga via exceção (AttributeError) atributo a atributo.
+_DERIVADOS = frozenset({"estado_nome", "historico", "historico_count", "consumo_wh_total", "ligada_desde"})
+_IGNORAR_NA_CARGA: Dict[str, frozenset] = {
+    TipoDeDispositivo.PORTA.name: _DERIVADOS,
+    TipoDeDispositivo.LUZ.name: _DERIVADOS | {"brilho", "cor"},
+    TipoDeDispositivo.TOMADA.name: _DERIVADOS | {"potencia_w"},
+    TipoDeDispositivo.CAFETEIRA.name: _DERIVADOS,
+    TipoDeDispositivo.RADIO.name: _DERIVADOS | {"volume", "estacao"},
+    TipoDeDispositivo.PERSIANA.name: _DERIVADOS | {"abertura"},
+}
 
 def _instanciar_dispositivo(tipo: str, cfg: dict) -> DispositivoBase | None:
     """Instancia um dispositivo a partir de configuração em dict lida do arquivo.
     Retorna None se não conseguir instanciar (tipo inválido ou erro).
     """
-    tipo_up = (tipo or "").upper()              # normaliza tipo
+    # tipo já canônico (caso comum: JSON salvo pelo hub) dispensa o upper(); senão normaliza
+    tipo_up = tipo if tipo in _INSTANCIADORES else (tipo or "").upper()
     id_ = cfg.get("id")                         # id é obrigatório
     nome = cfg.get("nome", id_)                 # nome opcional, default = id
     attrs = cfg.get("atributos", {}) or {}      # atributos opcionais
@@ -80,43 +184,19 @@ def _instanciar_dispositivo(tipo: str, cfg: dict) -> DispositivoBase | None:
     if not id_:
         raise ConfigInvalida("Dispositivo sem 'id' na configuração.", detalhes={"id": id_, "tipo": tipo_up})
     
+    instanciar = _INSTANCIADORES.get(tipo_up)  # tipo desconhecido: None (ignorado pelo loader)
+    if instanciar is None:
+        return None
+
     # tentar instanciar conforme tipo
     try:
-        if tipo_up == "PORTA":
-            return Porta(id=id_, nome=nome)
-        if tipo_up == "LUZ":
-            brilho = int(attrs.get("brilho", attrs.get("brilho_inicial", 0)))
-            cor = attrs.get("cor", attrs.get("cor_inicial", CorLuz.NEUTRA))
-            if isinstance(cor, str):
-                try:
-                    cor = CorLuz[cor.strip().upper()]
-                except Exception:
-                    cor = CorLuz.NEUTRA
-            return Luz(id=id_, nome=nome, brilho_inicial=brilho, cor_inicial=cor)
-        if tipo_up == "TOMADA":
-            pot = int(attrs.get("potencia_w", 0))
-            return Tomada(id=id_, nome=nome, potencia_w=pot)
-        if tipo_up == "CAFETEIRA":
-            return CafeteiraCapsulas(id=id_, nome=nome)
-        if tipo_up == "RADIO":
-            vol = int(attrs.get("volume", attrs.get("volume_inicial", 0)))
-            est = attrs.get("estacao", attrs.get("estacao_inicial", EstacaoRadio.MPB))
-            if isinstance(est, str):
-                try:
-                    est = EstacaoRadio[est.strip().upper()]
-                except Exception:
-                    est = EstacaoRadio.MPB
-            return Radio(id=id_, nome=nome, volume_inicial=vol, estacao_inicial=est)
-        if tipo_up == "PERSIANA":
-            ab = int(attrs.get("abertura", attrs.get("abertura_inicial", 0)))
-            return Persiana(id=id_, nome=nome, abertura_inicial=ab)
+        return instanciar(id_, nome, attrs)
     except Exception as e:
         # Propaga como ConfigInvalida para tratamento no loader
         raise ConfigInvalida(
             f"Erro instanciando dispositivo '{id_}' do tipo '{tipo_up}': {e}",
             detalhes={"id": id_, "tipo": tipo_up, "erro": str(e)}
         )
-    return None
 
 
 def carregar_config_hub(path: Path) -> Dict[str, Any]:
@@ -132,7 +212,7 @@ def carregar_config_hub(path: Path) -> Dict[str, Any]:
         return {"dispositivos": criar_dispositivos_default(), "rotinas": {}}
 
     try: # tentar ler JSON
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = _json.loads(path.read_bytes())
     except Exception:
         return {"dispositivos": criar_dispositivos_default(), "rotinas": {}}
 
@@ -159,12 +239,13 @@ def carregar_config_hub(path: Path) -> Dict[str, Any]:
                 continue
             if not disp:
                 continue
-            # aplicar atributos extras (se houver)
+            # aplicar atributos extras (se houver), exceto derivados/já aplicados no construtor
             attrs = cfg.get("atributos", {}) or {}
+            ignorar = _IGNORAR_NA_CARGA.get(TIPO_STR[disp.tipo], _DERIVADOS)
             for k, v in attrs.items():
+                if k in ignorar:
+                    continue
                 try:
-                    if k == "historico":
-                        continue
                     disp.alterar_atributo(k, v)
                 except Exception:
                     pass
@@ -172,8 +253,8 @@ def carregar_config_hub(path: Path) -> Dict[str, Any]:
         rotinas = data.get("rotinas", {})
         if not isinstance(rotinas, dict):
             rotinas = {}
-        # filtrar rotinas para listas
-        rotinas = {k: list(v) for k, v in rotinas.items() if isinstance(v, list)}
+        # filtrar rotinas para listas (recém-criadas pelo parser: sem cópia defensiva)
+        rotinas = {k: v for k, v in rotinas.items() if isinstance(v, list)}
         return {"dispositivos": dispositivos, "rotinas": rotinas}
 
     # caso contrário, formato inválido/desconhecido: usar defaults
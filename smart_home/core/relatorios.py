@@ -1,12 +1,16 @@
 # smart_home/core/relatorios.py: funções para gerar relatórios a partir dos logs
 from __future__ import annotations
+import copy
 import csv
 import json
+import time
+import zlib
 from pathlib import Path
-from typing import Dict, List, Iterable, Optional, Tuple, Any
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple, Any
 from datetime import datetime
 from collections import Counter, defaultdict
-from functools import reduce
+from functools import lru_cache, reduce
+from smart_home.core import _json
 # -------------------------------------------------------------------------------------------------
 # UTIL: LEITURA DE ARQUIVOS
 # -------------------------------------------------------------------------------------------------
@@ -15,76 +19,132 @@ _DT_FMT = "%Y-%m-%dT%H:%M:%S"  # formato primário de timestamps dos CSVs
 def _parse_dt(s: str) -> datetime:
     """Converte string em datetime.
 
-    Tenta primeiro o formato conhecido; se falhar, delega para fromisoformat
-    (aceitando também microssegundos).
+    `fromisoformat` (em C) cobre o formato dos CSVs (`_DT_FMT`) e também microssegundos;
+    strptime fica só como último recurso.
     """
     try:
-        return datetime.strptime(s, _DT_FMT)
-    except ValueError:
         return datetime.fromisoformat(s)
+    except ValueError:
+        return datetime.strptime(s, _DT_FMT)
 
-def ler_csv_transitions(path: Path) -> List[dict]:
-    """Lê `transitions.csv`.
+def _ler_csv_log(path: Path, inicio: Optional[datetime], fim: Optional[datetime]) -> Iterator[dict]:
+    """Percorre um CSV de log numa única passada, convertendo o timestamp.
 
-    Estrutura esperada: timestamp,id_dispositivo,evento,estado_origem,estado_destino
-    Linhas sem timestamp são ignoradas.
+    Linhas sem timestamp ou corrompidas são descartadas; o filtro de período
+    (se houver) é aplicado já na leitura, sem lista intermediária.
     """
     if not path.exists():
-        return []
-    rows: List[dict] = []
+        return
+    parse = _parse_dt
     with path.open("r", encoding="utf-8", newline="") as f:
         for row in csv.DictReader(f):
             ts = row.get("timestamp")
             if not ts:
                 continue
             try:
-                row["timestamp"] = _parse_dt(ts)
+                ts = parse(ts)
             except Exception:
                 continue  # descarta linha corrompida
-            rows.append(row)
-    return rows
+            if (inicio is not None and ts < inicio) or (fim is not None and ts > fim):
+                continue
+            row["timestamp"] = ts
+            yield row
 
-def ler_csv_events(path: Path) -> List[dict]:
-    """Lê `events.csv`.
+# arquivos modificados há menos que isso podem ter sido reescritos dentro do mesmo "tick"
+# de mtime do sistema de arquivos (resolução de até 2 s em alguns FS)
+_JANELA_RECENTE_NS = 2_000_000_000
+
+def _assinatura(path: Path) -> Optional[Tuple[int, ...]]:
+    """Chave de cache do arquivo, ou None se não existir: (inode, mtime_ns, tamanho).
 
-    Tenta desserializar a coluna 'extra' se for JSON plausível.
-    Linhas sem timestamp são ignoradas.
+    Se o arquivo foi modificado há pouco, uma reescrita com o mesmo tamanho no mesmo tick
+    de mtime não mudaria essa tupla; nesse caso entra também o CRC32 do conteúdo (ler os
+    bytes é barato perto de reprocessar o CSV/JSON).
     """
-    if not path.exists():
+    try:
+        st = path.stat()
+        assinatura: Tuple[int, ...] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if time.time_ns() - st.st_mtime_ns < _JANELA_RECENTE_NS:
+            assinatura += (zlib.crc32(path.read_bytes()),)
+    except OSError:
+        return None
+    return assinatura
+
+@lru_cache(maxsize=32)
+def _ler_csv_log_cache(path: Path, assinatura: Tuple[int, ...],
+                       inicio: Optional[datetime], fim: Optional[datetime]) -> Tuple[dict, ...]:
+    """Leitura memoizada por (arquivo, assinatura, período): relatórios seguidos (e o resumo,
+    que relê o mesmo CSV em cada sub-relatório) não reprocessam o arquivo se ele não mudou."""
+    return tuple(_ler_csv_log(path, inicio, fim))
+
+def _ler_log(path: Path, inicio: Optional[datetime], fim: Optional[datetime]) -> List[dict]:
+    """Linhas do CSV de log (via cache), copiadas a cada chamada: quem altera uma linha
+    devolvida não altera o cache (os valores, str/datetime, são imutáveis)."""
+    assinatura = _assinatura(path)
+    if assinatura is None:
         return []
-    rows: List[dict] = []
-    with path.open("r", encoding="utf-8", newline="") as f:
-        for row in csv.DictReader(f):
-            ts = row.get("timestamp")
-            if not ts:
-                continue
-            try:
-                row["timestamp"] = _parse_dt(ts)
-            except Exception:
-                continue
-            extra = row.get("extra")
-            if isinstance(extra, str) and extra:
-                # tenta um parse direto; se falhar, mantém string original
-                try:
-                    row["extra"] = json.loads(extra)
-                except Exception:
-                    try:
-                        # fallback leve: substituir aspas simples
-                        row["extra"] = json.loads(extra.replace("'", '"'))
-                    except Exception:
-                        pass
-            rows.append(row)
+    return [row.copy() for row in _ler_csv_log_cache(path, assinatura, inicio, fim)]
+
+def ler_csv_transitions(path: Path, inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> List[dict]:
+    """Lê `transitions.csv`.
+
+    Estrutura esperada: timestamp,id_dispositivo,evento,estado_origem,estado_destino
+    Linhas sem timestamp são ignoradas. `inicio`/`fim` (opcionais) filtram o período na leitura.
+    """
+    return _ler_log(path, inicio, fim)
+
+def _parse_extra(extra: str) -> Any:
+    """Desserializa a coluna 'extra' se for JSON plausível; senão mantém a string."""
+    # dicts gravados via repr ({'k': ...}) nunca são JSON válido: vai direto ao fallback
+    if not extra.startswith("{'"):
+        try:
+            return json.loads(extra)
+        except Exception:
+            pass
+    try:
+        # fallback leve: substituir aspas simples
+        return json.loads(extra.replace("'", '"'))
+    except Exception:
+        return extra
+
+def ler_csv_events(
+    path: Path,
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    com_extra: bool = True,
+) -> List[dict]:
+    """Lê `events.csv`.
+
+    Tenta desserializar a coluna 'extra' se for JSON plausível (desligável com
+    `com_extra=False` quando o relatório não usa a coluna).
+    Linhas sem timestamp são ignoradas. `inicio`/`fim` (opcionais) filtram o período na leitura.
+    """
+    rows = _ler_log(path, inicio, fim)
+    if not com_extra:
+        return rows
+    # as linhas já são cópias: 'extra' é desserializado no lugar (o cache fica intacto)
+    for row in rows:
+        extra = row.get("extra")
+        if isinstance(extra, str) and extra:
+            row["extra"] = _parse_extra(extra)
     return rows
 
 def ler_config(path: Path) -> Dict[str, dict]:
     """Lê `config.json` e devolve índice por id.
 
     Retorna dict vazio se arquivo não existir ou estiver corrompido.
+    Devolve uma cópia profunda do índice em cache (os atributos podem ter listas/dicts).
     """
-    if not path.exists():
+    assinatura = _assinatura(path)
+    if assinatura is None:
         return {}
+    return copy.deepcopy(_ler_config_cache(path, assinatura))
+
+@lru_cache(maxsize=8)
+def _ler_config_cache(path: Path, assinatura: Tuple[int, ...]) -> Dict[str, dict]:
+    """Índice por id memoizado pela assinatura do config.json (relido só se o arquivo mudar)."""
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = _json.loads(path.read_bytes())
     except Exception:
         return {}
     idx: Dict[str, dict] = {}
@@ -101,13 +161,8 @@ def ler_config(path: Path) -> Dict[str, dict]:
     return idx
 
 # -------------------------------------------------------------------------------------------------
-# FILTROS DE JANELA TEMPORAL
+# INTERVALOS LIGADO/DESLIGADO (o filtro de período já é aplicado na leitura dos CSVs)
 # -------------------------------------------------------------------------------------------------
-def _filtro_periodo(rows: Iterable[dict], inicio: Optional[datetime], fim: Optional[datetime]) -> List[dict]:
-    """Filtra registros entre [inicio, fim]."""
-    return [r for r in rows if (inicio is None or r["timestamp"] >= inicio) and (fim is None or r["timestamp"] <= fim)]
-
-
 def _intervalos_ligado(evts: List[dict], on_label: str, off_label: str, fim_periodo: Optional[datetime]) -> float:
     """Calcula total em horas (ou segundos, depois convertido) entre sequências ON/OFF.
 
@@ -146,7 +201,7 @@ def consumo_por_tomada(
 
     Se `incluir_total` for True, adiciona um registro agregado com id_dispositivo='__TOTAL__'.
     """
-    trans = _filtro_periodo(ler_csv_transitions(transitions_csv), inicio, fim)
+    trans = ler_csv_transitions(transitions_csv, inicio, fim)
     cfg = ler_config(config_json)
     pot_por_id: Dict[str, float] = {
         i: float(info.get("atributos", {}).get("potencia_w", 0))
@@ -194,7 +249,7 @@ def tempo_total_luzes_ligadas(
     fim: Optional[datetime] = None,
 ) -> List[dict]:
     """Calcula o tempo total (segundos) que cada luz permaneceu ligada."""
-    trans = _filtro_periodo(ler_csv_transitions(transitions_csv), inicio, fim)
+    trans = ler_csv_transitions(transitions_csv, inicio, fim)
     # Mantemos somente eventos onde houve efetiva mudança de estado para reduzir ruído
     trans = [r for r in trans if r.get("estado_origem") != r.get("estado_destino")]
     cfg = ler_config(config_json)
@@ -233,8 +288,8 @@ def dispositivos_mais_usados(
     fim: Optional[datetime] = None,
 ) -> List[Tuple[str, int]]:
     """Retorna tuplas (id, quantidade_eventos) ordenadas por uso decrescente."""
-    trans = _filtro_periodo(ler_csv_transitions(transitions_csv), inicio, fim)
-    evs = _filtro_periodo(ler_csv_events(events_csv), inicio, fim)
+    trans = ler_csv_transitions(transitions_csv, inicio, fim)
+    evs = ler_csv_events(events_csv, inicio, fim, com_extra=False)
     c = Counter()
     c.update([r.get("id_dispositivo") for r in trans if r.get("id_dispositivo")])
     c.update([r.get("id") for r in evs if r.get("id")])
@@ -250,7 +305,7 @@ def cafes_preparados(
     fim: Optional[datetime] = None,
 ) -> int:
     """Conta quantos preparos de café foram concluídos no período."""
-    trans = _filtro_periodo(ler_csv_transitions(transitions_csv), inicio, fim)
+    trans = ler_csv_transitions(transitions_csv, inicio, fim)
     def _ok(r: dict) -> bool:
         ev = (r.get("evento") or "").lower()
         so = (r.get("estado_origem") or "").upper()
@@ -267,7 +322,7 @@ def cafes_por_dia(
 
     Usa mesma lógica de detecção de preparo concluído de `cafes_preparados`.
     """
-    trans = _filtro_periodo(ler_csv_transitions(transitions_csv), inicio, fim)
+    trans = ler_csv_transitions(transitions_csv, inicio, fim)
     def _ok(r: dict) -> bool:
         ev = (r.get("evento") or "").lower()
         so = (r.get("estado_origem") or "").upper()
@@ -294,7 +349,7 @@ def distribuicao_comandos_por_tipo(
     fim: Optional[datetime] = None,
 ) -> List[Tuple[str, int]]:
     """Distribuição de COMANDO_EXECUTADO por tipo de dispositivo."""
-    evs = _filtro_periodo(ler_csv_events(events_csv), inicio, fim)
+    evs = ler_csv_events(events_csv, inicio, fim, com_extra=False)
     cfg = ler_config(config_json)
     id_tipo = {i: info.get("tipo", "DESCONHECIDO") for i, info in cfg.items()}
     c = Counter()
@@ -314,6 +369,9 @@ def resumo(
     """Gera um resumo consolidado com métricas principais.
 
     Inclui: consumo por tomada, top dispositivos, cafés preparados, distribuição por tipo e tempo de luzes.
+    Os sub-relatórios rodam em sequência: compartilham as leituras memoizadas dos CSVs/config
+    (cada arquivo é processado uma vez) e o restante é Python puro preso ao GIL, então threads
+    não trariam ganho.
     """
     return {
         "consumo_tomadas": consumo_por_tomada(transitions_csv, config_json, inicio, fim, incluir_total=True),
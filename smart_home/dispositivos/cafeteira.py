@@ -1,9 +1,10 @@
 # smart_home/dispositivos/cafeteira.py : implementação da classe Cafeteira com FSM.
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict, List
 from datetime import datetime
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import TIPO_STR, DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido
 #--------------------------------------------------------------------------------------------------------------
@@ -21,9 +22,8 @@ VOLUME_POR_BEBIDA = 100  # cada preparo consome 100ml
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODO AUXILIAR PARA NOMES DE ESTADO
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 #--------------------------------------------------------------------------------------------------------------
 # CLASSE CAFETEIRA
 #--------------------------------------------------------------------------------------------------------------
@@ -44,6 +44,128 @@ class CafeteiraCapsulas(DispositivoBase):
         bloqueado em PREPARANDO
     - A cafeteira sempre nasce cheia: 1000 ml de água e 10 cápsulas.
     """
+
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "ligar": "DESLIGADA → PRONTA",
+        "desligar": "PRONTA/SEM_RECURSOS → DESLIGADA (bloqueado em PREPARANDO)",
+        "preparar_bebida": "PRONTA → PREPARANDO (se houver recursos)",
+        "finalizar_preparo": "PREPARANDO → PRONTA (consome 100ml e 1 cápsula)",
+        "reabastecer_maquina": "Repõe água e cápsulas ao máximo",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoCafeteira.DESLIGADA, EstadoCafeteira.PRONTA, EstadoCafeteira.PREPARANDO, EstadoCafeteira.SEM_RECURSOS)
+    _TRANSICOES = (
+        # energia
+        {
+        "trigger": "ligar",
+        "source": EstadoCafeteira.DESLIGADA,
+        "dest": EstadoCafeteira.PRONTA,
+        "after": "_apos_comando"
+        },
+        {
+        "trigger": "desligar",
+        "source": [EstadoCafeteira.PRONTA, EstadoCafeteira.SEM_RECURSOS],
+        "dest": EstadoCafeteira.DESLIGADA,
+        "after": "_apos_comando"                         # log do comando
+        },
+        {
+        "trigger": "desligar",
+        "source": EstadoCafeteira.PREPARANDO,
+        "dest": EstadoCafeteira.PREPARANDO,
+        "after": "_comando_bloqueado"                    # bloqueado se estiver preparando
+        },
+        # preparo
+        {
+        "trigger": "preparar_bebida",
+        "source": EstadoCafeteira.PRONTA,
+        "dest": EstadoCafeteira.PREPARANDO,
+        "conditions": "_recursos_ok",                     # só prepara se houver recursos
+        "after": "_apos_comando"                          # log do comando
+        },
+        {
+        "trigger": "preparar_bebida",
+        "source": EstadoCafeteira.PRONTA,
+        "dest": EstadoCafeteira.SEM_RECURSOS,
+        "unless": "_recursos_ok",                         # só prepara se houver recursos
+        "after": "_faltou_recurso"                        # log de falta de recurso
+        },
+        {
+        "trigger": "finalizar_preparo",
+        "source": EstadoCafeteira.PREPARANDO,
+        "dest": EstadoCafeteira.PRONTA,
+        "before": "_consumir_e_registrar",                # consome recursos e registra no histórico
+        "after": "_apos_comando"                          # log do comando
+        },
+        # reabastecer (preventivo e por falta)
+        {
+        "trigger": "reabastecer_maquina",
+        "source": EstadoCafeteira.SEM_RECURSOS,
+        "dest": EstadoCafeteira.PRONTA,
+        "before": "_reabastecer_total",                   # reabastece todos os recursos
+        "after": "_apos_comando"                          # log do comando
+        },
+        {
+        "trigger": "reabastecer_maquina",
+        "source": EstadoCafeteira.PRONTA,
+        "dest": EstadoCafeteira.PRONTA,
+        "before": "_reabastecer_total",                   # reabastece todos os recursos
+        "after": "_apos_comando"                          # log do comando
+        },
+        {
+        "trigger": "reabastecer_maquina",
+        "source": EstadoCafeteira.DESLIGADA,
+        "dest": EstadoCafeteira.DESLIGADA,
+        "before": "_reabastecer_total",                   # reabastece todos os recursos
+        "after": "_apos_comando"                          # log do comando
+        },
+        {
+        "trigger": "reabastecer_maquina",
+        "source": EstadoCafeteira.PREPARANDO,
+        "dest": EstadoCafeteira.PREPARANDO,
+        "after": "_comando_bloqueado"                     # bloqueado se estiver preparando
+        },
+        # bloqueios adicionais (self-loops com comando_bloqueado)
+        {
+            "trigger": "preparar_bebida", 
+            "source": EstadoCafeteira.DESLIGADA, 
+            "dest": EstadoCafeteira.DESLIGADA, "after": "_comando_bloqueado"
+        },
+        {
+            "trigger": "finalizar_preparo", 
+            "source": EstadoCafeteira.DESLIGADA, 
+            "dest": EstadoCafeteira.DESLIGADA, "after": "_comando_bloqueado"
+        },
+        {
+            "trigger": "finalizar_preparo", 
+            "source": EstadoCafeteira.PRONTA,
+            "dest": EstadoCafeteira.PRONTA,
+            "after": "_comando_bloqueado"
+        },
+        # bloqueios de 'ligar' (já ligado/ativo)
+        {
+            "trigger": "ligar", 
+            "source": EstadoCafeteira.PRONTA,       
+            "dest": EstadoCafeteira.PRONTA,       
+            "after": "_comando_bloqueado"
+        },
+        {
+            "trigger": "ligar", 
+            "source": EstadoCafeteira.PREPARANDO,   
+            "dest": EstadoCafeteira.PREPARANDO,   
+            "after": "_comando_bloqueado"
+        },
+        {
+            "trigger": "ligar", 
+            "source": EstadoCafeteira.SEM_RECURSOS, 
+            "dest": EstadoCafeteira.SEM_RECURSOS, 
+            "after": "_comando_bloqueado"
+        },
+
+    )
+
     def __init__(self, id: str, nome: str):
         super().__init__(id=id, nome=nome, tipo=TipoDeDispositivo.CAFETEIRA, estado=EstadoCafeteira.DESLIGADA)
 
@@ -55,127 +177,8 @@ class CafeteiraCapsulas(DispositivoBase):
         self.total_bebidas: int = 0
         self.historico: List[Dict[str, Any]] = []
         
-        # estados possíveis e transições
-        estados = [EstadoCafeteira.DESLIGADA, EstadoCafeteira.PRONTA, EstadoCafeteira.PREPARANDO, EstadoCafeteira.SEM_RECURSOS]
-        transicoes = [
-            # energia
-            {
-            "trigger": "ligar",
-            "source": EstadoCafeteira.DESLIGADA,
-            "dest": EstadoCafeteira.PRONTA,
-            "after": "_apos_comando"
-            },
-            {
-            "trigger": "desligar",
-            "source": [EstadoCafeteira.PRONTA, EstadoCafeteira.SEM_RECURSOS],
-            "dest": EstadoCafeteira.DESLIGADA,
-            "after": "_apos_comando"                         # log do comando
-            },
-            {
-            "trigger": "desligar",
-            "source": EstadoCafeteira.PREPARANDO,
-            "dest": EstadoCafeteira.PREPARANDO,
-            "after": "_comando_bloqueado"                    # bloqueado se estiver preparando
-            },
-            # preparo
-            {
-            "trigger": "preparar_bebida",
-            "source": EstadoCafeteira.PRONTA,
-            "dest": EstadoCafeteira.PREPARANDO,
-            "conditions": "_recursos_ok",                     # só prepara se houver recursos
-            "after": "_apos_comando"                          # log do comando
-            },
-            {
-            "trigger": "preparar_bebida",
-            "source": EstadoCafeteira.PRONTA,
-            "dest": EstadoCafeteira.SEM_RECURSOS,
-            "unless": "_recursos_ok",                         # só prepara se houver recursos
-            "after": "_faltou_recurso"                        # log de falta de recurso
-            },
-            {
-            "trigger": "finalizar_preparo",
-            "source": EstadoCafeteira.PREPARANDO,
-            "dest": EstadoCafeteira.PRONTA,
-            "before": "_consumir_e_registrar",                # consome recursos e registra no histórico
-            "after": "_apos_comando"                          # log do comando
-            },
-            # reabastecer (preventivo e por falta)
-            {
-            "trigger": "reabastecer_maquina",
-            "source": EstadoCafeteira.SEM_RECURSOS,
-            "dest": EstadoCafeteira.PRONTA,
-            "before": "_reabastecer_total",                   # reabastece todos os recursos
-            "after": "_apos_comando"                          # log do comando
-            },
-            {
-            "trigger": "reabastecer_maquina",
-            "source": EstadoCafeteira.PRONTA,
-            "dest": EstadoCafeteira.PRONTA,
-            "before": "_reabastecer_total",                   # reabastece todos os recursos
-            "after": "_apos_comando"                          # log do comando
-            },
-            {
-            "trigger": "reabastecer_maquina",
-            "source": EstadoCafeteira.DESLIGADA,
-            "dest": EstadoCafeteira.DESLIGADA,
-            "before": "_reabastecer_total",                   # reabastece todos os recursos
-            "after": "_apos_comando"                          # log do comando
-            },
-            {
-            "trigger": "reabastecer_maquina",
-            "source": EstadoCafeteira.PREPARANDO,
-            "dest": EstadoCafeteira.PREPARANDO,
-            "after": "_comando_bloqueado"                     # bloqueado se estiver preparando
-            },
-            # bloqueios adicionais (self-loops com comando_bloqueado)
-            {
-                "trigger": "preparar_bebida", 
-                "source": EstadoCafeteira.DESLIGADA, 
-                "dest": EstadoCafeteira.DESLIGADA, "after": "_comando_bloqueado"
-            },
-            {
-                "trigger": "finalizar_preparo", 
-                "source": EstadoCafeteira.DESLIGADA, 
-                "dest": EstadoCafeteira.DESLIGADA, "after": "_comando_bloqueado"
-            },
-            {
-                "trigger": "finalizar_preparo", 
-                "source": EstadoCafeteira.PRONTA,
-                "dest": EstadoCafeteira.PRONTA,
-                "after": "_comando_bloqueado"
-            },
-            # bloqueios de 'ligar' (já ligado/ativo)
-            {
-                "trigger": "ligar", 
-                "source": EstadoCafeteira.PRONTA,       
-                "dest": EstadoCafeteira.PRONTA,       
-                "after": "_comando_bloqueado"
-            },
-            {
-                "trigger": "ligar", 
-                "source": EstadoCafeteira.PREPARANDO,   
-                "dest": EstadoCafeteira.PREPARANDO,   
-                "after": "_comando_bloqueado"
-            },
-            {
-                "trigger": "ligar", 
-                "source": EstadoCafeteira.SEM_RECURSOS, 
-                "dest": EstadoCafeteira.SEM_RECURSOS, 
-                "after": "_comando_bloqueado"
-            },
-
-        ]
-  
-        # criar a máquina
-        self.maquina = Machine(
-            model=self,                                                            # o próprio objeto Cafeteira é o modelo
-            states=estados,                                                        # estados possíveis
-            transitions=transicoes,                                                # transições definidas
-            initial=EstadoCafeteira.DESLIGADA,                                     # estado inicial
-            model_attribute="estado",                                              # atributo que guarda o estado atual
-            send_event=True,                                                       # envia o evento para os callbacks
-            after_state_change=self._apos_transicao,                               # callback após qualquer transição
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(EstadoCafeteira.DESLIGADA)
         
     #--------------------------------------------------------------------------------------------------------------
     # GUARDS(VERIFICADORES DE CONDIÇÃO) E AÇÕES
@@ -224,7 +227,7 @@ class CafeteiraCapsulas(DispositivoBase):
         if comando not in mapa:
             raise ComandoInvalido(
                 f"Comando '{comando}' nao suportado para cafeteira '{self.id}'.",
-                detalhes={"id": self.id, "tipo": self.tipo.value, "comando": comando}
+                detalhes={"id": self.id, "tipo": TIPO_STR[self.tipo], "comando": comando}
             )
         
         try:
@@ -253,21 +256,6 @@ class CafeteiraCapsulas(DispositivoBase):
             "total_bebidas": self.total_bebidas,         # total de bebidas preparadas
             "historico_count": len(self.historico),      # quantidade de registros no histórico
         }
-
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """
-        Retorna os comandos disponíveis para a cafeteira.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        return {
-            "ligar": "DESLIGADA → PRONTA",
-            "desligar": "PRONTA/SEM_RECURSOS → DESLIGADA (bloqueado em PREPARANDO)",
-            "preparar_bebida": "PRONTA → PREPARANDO (se houver recursos)",
-            "finalizar_preparo": "PREPARANDO → PRONTA (consome 100ml e 1 cápsula)",
-            "reabastecer_maquina": "Repõe água e cápsulas ao máximo",
-        }
     #--------------------------------------------------------------------------------------------------------------
     # CALLBACKS/ LOGGING HELPERS
     #--------------------------------------------------------------------------------------------------------------
@@ -1,8 +1,9 @@
 # smart_home/dispositivos/luz.py: implementação da classe Luz com FSM.
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido, AtributoInvalido
 #--------------------------------------------------------------------------------------------------------------
@@ -19,9 +20,8 @@ class CorLuz(Enum):
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODO AUXILIAR PARA NOMES DE ESTADO
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 #--------------------------------------------------------------------------------------------------------------
 # CLASSE LUZ
 #--------------------------------------------------------------------------------------------------------------
@@ -38,6 +38,67 @@ class Luz(DispositivoBase):
     - brilho: int (0-100)
     - cor: CorLuz (QUENTE, FRIA, NEUTRA)
     """
+
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "ligar": "DESLIGADA → LIGADA (restaura último brilho ou 100)",
+        "desligar": "LIGADA → DESLIGADA (salva último brilho e zera)",
+        "definir_brilho": "Ajusta brilho (0..100) — requer LIGADA",
+        "definir_cor": "Ajusta cor (QUENTE/FRIA/NEUTRA) — requer LIGADA",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoLuz.DESLIGADA, EstadoLuz.LIGADA)
+    _TRANSICOES = (
+        # ligar / desligar com restauração/persistência de brilho
+        {
+            "trigger": "ligar",
+            "source": EstadoLuz.DESLIGADA,
+            "dest": EstadoLuz.LIGADA,
+            "before": "_restaurar_brilho_ao_ligar",       # restaurar último brilho > 0
+            "after": "_apos_comando"                      # log do comando
+        },
+        {
+            "trigger": "desligar",
+            "source": EstadoLuz.LIGADA,                    
+            "dest": EstadoLuz.DESLIGADA,
+            "before": "_salvar_brilho_ao_desligar",       # salvar último brilho > 0
+            "after": "_apos_comando"                      # log do comando
+        },
+        
+        # definir_brilho: permitido somente quando a luz está LIGADA (on -> on)
+        {
+            "trigger": "definir_brilho",
+            "source": EstadoLuz.LIGADA,
+            "dest": EstadoLuz.LIGADA,
+            "before": "_escolher_brilho",                 # validar e definir brilho
+            "after": "_apos_comando"                      # log do comando
+        },
+        # tentativa com luz desligada → bloqueada (self-loop em DESLIGADA, apenas log)
+        {
+            "trigger": "definir_brilho",
+            "source": EstadoLuz.DESLIGADA,
+            "dest": EstadoLuz.DESLIGADA,
+            "after": "_comando_bloqueado"                 # log do comando bloqueado
+        },
+
+        # definir_cor: permitido somente quando a luz está LIGADA (on -> on)
+        {
+            "trigger": "definir_cor",
+            "source": EstadoLuz.LIGADA,
+            "dest": EstadoLuz.LIGADA,
+            "before": "_escolher_cor",                    # validar e definir cor
+            "after": "_apos_comando"                      # log do comando
+        },
+        # tentativa com luz desligada → bloqueada
+        {
+            "trigger": "definir_cor",
+            "source": EstadoLuz.DESLIGADA,
+            "dest": EstadoLuz.DESLIGADA,
+            "after": "_comando_bloqueado"                 # log do comando bloqueado
+        },
+    )
     
     def __init__(self, id: str, nome: str, *, brilho_inicial: int = 0, cor_inicial: CorLuz = CorLuz.NEUTRA):
         super().__init__(id=id, nome=nome, tipo=TipoDeDispositivo.LUZ, estado=EstadoLuz.DESLIGADA)
@@ -51,68 +112,8 @@ class Luz(DispositivoBase):
         self.cor = cor_inicial           # validar via propriedade, inicializa _cor 
 
         
-        # estados possíveis e transições
-        estados = [EstadoLuz.DESLIGADA, EstadoLuz.LIGADA]
-        transicoes = [
-            # ligar / desligar com restauração/persistência de brilho
-            {
-                "trigger": "ligar",
-                "source": EstadoLuz.DESLIGADA,
-                "dest": EstadoLuz.LIGADA,
-                "before": "_restaurar_brilho_ao_ligar",       # restaurar último brilho > 0
-                "after": "_apos_comando"                      # log do comando
-            },
-            {
-                "trigger": "desligar",
-                "source": EstadoLuz.LIGADA,                    
-                "dest": EstadoLuz.DESLIGADA,
-                "before": "_salvar_brilho_ao_desligar",       # salvar último brilho > 0
-                "after": "_apos_comando"                      # log do comando
-            },
-            
-            # definir_brilho: permitido somente quando a luz está LIGADA (on -> on)
-            {
-                "trigger": "definir_brilho",
-                "source": EstadoLuz.LIGADA,
-                "dest": EstadoLuz.LIGADA,
-                "before": "_escolher_brilho",                 # validar e definir brilho
-                "after": "_apos_comando"                      # log do comando
-            },
-            # tentativa com luz desligada → bloqueada (self-loop em DESLIGADA, apenas log)
-            {
-                "trigger": "definir_brilho",
-                "source": EstadoLuz.DESLIGADA,
-                "dest": EstadoLuz.DESLIGADA,
-                "after": "_comando_bloqueado"                 # log do comando bloqueado
-            },
-
-            # definir_cor: permitido somente quando a luz está LIGADA (on -> on)
-            {
-                "trigger": "definir_cor",
-                "source": EstadoLuz.LIGADA,
-                "dest": EstadoLuz.LIGADA,
-                "before": "_escolher_cor",                    # validar e definir cor
-                "after": "_apos_comando"                      # log do comando
-            },
-            # tentativa com luz desligada → bloqueada
-            {
-                "trigger": "definir_cor",
-                "source": EstadoLuz.DESLIGADA,
-                "dest": EstadoLuz.DESLIGADA,
-                "after": "_comando_bloqueado"                 # log do comando bloqueado
-            },
-        ]
-        
-        # criar a máquina
-        self.maquina = Machine(
-            model=self,                                                            # o próprio objeto Luz é o modelo
-            states=estados,                                                        # estados possíveis
-            transitions=transicoes,                                                # transições definidas
-            initial=EstadoLuz.DESLIGADA if self.brilho == 0 else EstadoLuz.LIGADA, # estado inicial
-            model_attribute="estado",                                              # atributo que guarda o estado atual
-            send_event=True,                                                       # envia o evento para os callbacks
-            after_state_change=self._apos_transicao,                               # callback após qualquer transição
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(EstadoLuz.DESLIGADA if self.brilho == 0 else EstadoLuz.LIGADA)
     #--------------------------------------------------------------------------------------------------------------
     # PROPRIEDADES COM VALIDAÇÃO
     #--------------------------------------------------------------------------------------------------------------
@@ -218,19 +219,6 @@ class Luz(DispositivoBase):
             "cor": self.cor.name,
             "estado_nome": _nome_estado(self.estado)
         }
-
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """Retorna os comandos disponíveis para a luz.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        return {
-            "ligar": "DESLIGADA → LIGADA (restaura último brilho ou 100)",
-            "desligar": "LIGADA → DESLIGADA (salva último brilho e zera)",
-            "definir_brilho": "Ajusta brilho (0..100) — requer LIGADA",
-            "definir_cor": "Ajusta cor (QUENTE/FRIA/NEUTRA) — requer LIGADA",
-        }
         
     #--------------------------------------------------------------------------------------------------------------
     # CALLBACKS/ LOGGING HELPERS
@@ -1,8 +1,9 @@
 # smart_home/dispositivos/persiana.py
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido, AtributoInvalido
 # --------------------------------------------------------------------------------------------------
@@ -15,9 +16,8 @@ class EstadoPersiana(Enum):
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODOS AUXILIARES PARA NOMES DE ESTADO E LEITURA DE ARGUMENTOS
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 
 def _parse_percentual(v: Any) -> int:
     """
@@ -60,6 +60,76 @@ class Persiana(DispositivoBase):
     * -> FECHADA  se percentual==0
     * -> PARCIAL  se 1<=percentual<=99
     """
+
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "abrir": "FECHADA|PARCIAL → ABERTA (abertura=100)",
+        "fechar": "ABERTA|PARCIAL → FECHADA (abertura=0)",
+        "ajustar": "Ajusta abertura (0-100): 0 → FECHADA, 100 → ABERTA, 1-99 → PARCIAL",
+        "abrir_parcial": "Atalho: ajustar(percentual=1..99)",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoPersiana.FECHADA, EstadoPersiana.PARCIAL, EstadoPersiana.ABERTA)
+    _TRANSICOES = (
+        # abrir persiana
+        {
+            "trigger": "abrir",  
+            "source": [EstadoPersiana.FECHADA, EstadoPersiana.PARCIAL],
+            "dest": EstadoPersiana.ABERTA, 
+            "before": "_abrir_total",                                         # abre totalmente
+            "after": "_apos_comando"                                          # log do comando
+        },
+        {
+            "trigger": "abrir",
+            "source": EstadoPersiana.ABERTA,
+            "dest": EstadoPersiana.ABERTA,
+            "after": "_comando_redundante"                                    # log de comando redundante
+        },
+
+        # fechar persiana
+        {
+            "trigger": "fechar", 
+            "source": [EstadoPersiana.ABERTA, EstadoPersiana.PARCIAL],
+            "dest": EstadoPersiana.FECHADA, 
+            "before": "_fechar_total",                                        # fecha totalmente
+            "after": "_apos_comando"                                          # log do comando
+        },
+        {
+            "trigger": "fechar", 
+            "source": EstadoPersiana.FECHADA,
+            "dest": EstadoPersiana.FECHADA, 
+            "after": "_comando_redundante"                                    # log de comando redundante
+        },
+
+        # ajustar(percentual)
+        {
+            "trigger": "ajustar", 
+            "source": _ESTADOS, 
+            "dest": EstadoPersiana.ABERTA,
+            "conditions": "_guard_ajuste_aberta",                             # só vai para ABERTA se percentual==100
+            "before": "_aplicar_percentual",                                  # aplica o percentual
+            "after": "_apos_comando"                                          # log do comando
+        },
+        {
+            "trigger": "ajustar", 
+            "source": _ESTADOS, 
+            "dest": EstadoPersiana.FECHADA,
+            "conditions": "_guard_ajuste_fechada",                            # só vai para FECHADA se percentual==0
+            "before": "_aplicar_percentual",                                  # aplica o percentual
+            "after": "_apos_comando"                                          # log do comando
+        },
+        {
+            "trigger": "ajustar", 
+            "source": _ESTADOS, 
+            "dest": EstadoPersiana.PARCIAL,
+            "conditions": "_guard_ajuste_parcial",                            # só vai para PARCIAL se 1<=percentual<=99
+            "before": "_aplicar_percentual",                                  # aplica o percentual
+            "after": "_apos_comando"                                          # log do comando
+        },
+    )
+
     def __init__(self, id: str, nome: str, *, abertura_inicial: int = 0):
         estado_inicial = (
             EstadoPersiana.ABERTA if abertura_inicial == 100
@@ -71,76 +141,8 @@ class Persiana(DispositivoBase):
         self._abertura: int = 0
         self.abertura = abertura_inicial  # valida via setter
 
-        # estados e transições
-        estados = [EstadoPersiana.FECHADA, EstadoPersiana.PARCIAL, EstadoPersiana.ABERTA]
-        transicoes = [
-            # abrir persiana
-            {
-                "trigger": "abrir",  
-                "source": [EstadoPersiana.FECHADA, EstadoPersiana.PARCIAL],
-                "dest": EstadoPersiana.ABERTA, 
-                "before": "_abrir_total",                                         # abre totalmente
-                "after": "_apos_comando"                                          # log do comando
-            },
-            {
-                "trigger": "abrir",
-                "source": EstadoPersiana.ABERTA,
-                "dest": EstadoPersiana.ABERTA,
-                "after": "_comando_redundante"                                    # log de comando redundante
-            },
-
-            # fechar persiana
-            {
-                "trigger": "fechar", 
-                "source": [EstadoPersiana.ABERTA, EstadoPersiana.PARCIAL],
-                "dest": EstadoPersiana.FECHADA, 
-                "before": "_fechar_total",                                        # fecha totalmente
-                "after": "_apos_comando"                                          # log do comando
-            },
-            {
-                "trigger": "fechar", 
-                "source": EstadoPersiana.FECHADA,
-                "dest": EstadoPersiana.FECHADA, 
-                "after": "_comando_redundante"                                    # log de comando redundante
-            },
-
-            # ajustar(percentual)
-            {
-                "trigger": "ajustar", 
-                "source": estados, 
-                "dest": EstadoPersiana.ABERTA,
-                "conditions": "_guard_ajuste_aberta",                             # só vai para ABERTA se percentual==100
-                "before": "_aplicar_percentual",                                  # aplica o percentual
-                "after": "_apos_comando"                                          # log do comando
-            },
-            {
-                "trigger": "ajustar", 
-                "source": estados, 
-                "dest": EstadoPersiana.FECHADA,
-                "conditions": "_guard_ajuste_fechada",                            # só vai para FECHADA se percentual==0
-                "before": "_aplicar_percentual",                                  # aplica o percentual
-                "after": "_apos_comando"                                          # log do comando
-            },
-            {
-                "trigger": "ajustar", 
-                "source": estados, 
-                "dest": EstadoPersiana.PARCIAL,
-                "conditions": "_guard_ajuste_parcial",                            # só vai para PARCIAL se 1<=percentual<=99
-                "before": "_aplicar_percentual",                                  # aplica o percentual
-                "after": "_apos_comando"                                          # log do comando
-            },
-        ]
-
-        # criar a máquina
-        self.maquina = Machine(
-            model=self,                                                   # o próprio objeto Persiana é o modelo
-            states=estados,                                               # estados possíveis
-            transitions=transicoes,                                       # transições definidas
-            initial=estado_inicial,                                       # estado inicial
-            model_attribute="estado",                                     # atributo que guarda o estado atual
-            send_event=True,                                              # envia o evento para os callbacks
-            after_state_change=self._apos_transicao,                      # callback após qualquer transição
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(estado_inicial)
 
     #--------------------------------------------------------------------------------------------------------------
     # PROPRIEDADE COM VALIDAÇÃO
@@ -267,19 +269,6 @@ class Persiana(DispositivoBase):
             "abertura": self.abertura,
         }
 
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """Retorna os comandos disponíveis para a persiana.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        return {
-            "abrir": "FECHADA|PARCIAL → ABERTA (abertura=100)",
-            "fechar": "ABERTA|PARCIAL → FECHADA (abertura=0)",
-            "ajustar": "Ajusta abertura (0-100): 0 → FECHADA, 100 → ABERTA, 1-99 → PARCIAL",
-            "abrir_parcial": "Atalho: ajustar(percentual=1..99)",
-        }
-
     # ----------------------------------------------------------------------------------------------
     # CALLBACKS / LOGGING HELPERS
     # ----------------------------------------------------------------------------------------------
@@ -1,8 +1,9 @@
 # smart_home/dispositivos/porta.py : implementação da classe Porta com FSM.
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import TIPO_STR, DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido
 #--------------------------------------------------------------------------------------------------------------
@@ -15,9 +16,8 @@ class EstadoPorta(Enum):
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODO AUXILIAR PARA NOMES DE ESTADO
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 #--------------------------------------------------------------------------------------------------------------
 # CLASSE PORTA
 #--------------------------------------------------------------------------------------------------------------
@@ -35,58 +35,59 @@ class Porta(DispositivoBase):
     -  incrementar tentativas_invalidas
     """
 
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "destrancar": "TRANCADA → DESTRANCADA",
+        "trancar": "DESTRANCADA → TRANCADA (bloqueado se ABERTA)",
+        "abrir": "DESTRANCADA → ABERTA",
+        "fechar": "ABERTA → DESTRANCADA",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoPorta.TRANCADA, EstadoPorta.DESTRANCADA, EstadoPorta.ABERTA)
+    _TRANSICOES = (
+        # transições válidas
+        {
+            "trigger": "destrancar",
+            "source" : EstadoPorta.TRANCADA,
+            "dest"   : EstadoPorta.DESTRANCADA,
+            "after": "_apos_comando",                    # log após o comando
+        },
+        {
+            "trigger": "trancar",
+            "source": EstadoPorta.DESTRANCADA,
+            "dest": EstadoPorta.TRANCADA,
+            "after": "_apos_comando",                   # log após o comando
+        },
+        {
+            "trigger": "abrir",
+            "source": EstadoPorta.DESTRANCADA,
+            "dest": EstadoPorta.ABERTA,
+            "after": "_apos_comando",                   # log após o comando
+        },
+        {
+            "trigger": "fechar",                       
+            "source": EstadoPorta.ABERTA,
+            "dest": EstadoPorta.DESTRANCADA,
+            "after": "_apos_comando",                  # log após o comando
+        },
+        # tentativa inválida: trancar quando ABERTA -> permanece ABERTA, conta tentativa
+        {
+            "trigger": "trancar",
+            "source": EstadoPorta.ABERTA,
+            "dest": EstadoPorta.ABERTA,                # permanece no mesmo estado 
+            "before": "_contar_tentativa_invalida",
+            "after": "_apos_comando_invalido",         # log após o comando inválido
+        },
+    )
+
     def __init__(self, id: str, nome: str):
         super().__init__(id=id, nome=nome, tipo=TipoDeDispositivo.PORTA, estado=EstadoPorta.TRANCADA)
         self.tentativas_invalidas: int = 0  # contador de tentativas inválidas de trancar a porta quando aberta
         
-        # estados possíveis e transições
-        estados = [EstadoPorta.TRANCADA, EstadoPorta.DESTRANCADA, EstadoPorta.ABERTA]
-        transicoes = [
-            # transições válidas
-            {
-                "trigger": "destrancar",
-                "source" : EstadoPorta.TRANCADA,
-                "dest"   : EstadoPorta.DESTRANCADA,
-                "after": "_apos_comando",                    # log após o comando
-            },
-            {
-                "trigger": "trancar",
-                "source": EstadoPorta.DESTRANCADA,
-                "dest": EstadoPorta.TRANCADA,
-                "after": "_apos_comando",                   # log após o comando
-            },
-            {
-                "trigger": "abrir",
-                "source": EstadoPorta.DESTRANCADA,
-                "dest": EstadoPorta.ABERTA,
-                "after": "_apos_comando",                   # log após o comando
-            },
-            {
-                "trigger": "fechar",                       
-                "source": EstadoPorta.ABERTA,
-                "dest": EstadoPorta.DESTRANCADA,
-                "after": "_apos_comando",                  # log após o comando
-            },
-            # tentativa inválida: trancar quando ABERTA -> permanece ABERTA, conta tentativa
-            {
-                "trigger": "trancar",
-                "source": EstadoPorta.ABERTA,
-                "dest": EstadoPorta.ABERTA,                # permanece no mesmo estado 
-                "before": "_contar_tentativa_invalida",
-                "after": "_apos_comando_invalido",         # log após o comando inválido
-            },
-        ]
-    
-        # criar a máquina 
-        self.maquina = Machine(
-            model=self,                               # o próprio objeto Porta é o modelo
-            states=estados,                           # estados possíveis
-            transitions=transicoes,                   # transições definidas
-            initial=EstadoPorta.TRANCADA,             # estado inicial
-            model_attribute="estado",                 # atributo que guarda o estado atual
-            send_event=True,                          # envia o evento para os callbacks
-            after_state_change=self._apos_transicao,  # callback após qualquer transição
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(EstadoPorta.TRANCADA)
 
     #--------------------------------------------------------------------------------------------------------------
     # MÉTODOS ABSTRATOS IMPLEMENTADOS
@@ -110,7 +111,7 @@ class Porta(DispositivoBase):
         if comando not in mapa:
             raise ComandoInvalido(
                 f"Comando '{comando}' nao suportado para porta '{self.id}'.",
-                detalhes={"id": self.id, "tipo": self.tipo.value, "comando": comando}
+                detalhes={"id": self.id, "tipo": TIPO_STR[self.tipo], "comando": comando}
             )
         
         
@@ -135,18 +136,6 @@ class Porta(DispositivoBase):
         return {"tentativas_invalidas": self.tentativas_invalidas, "estado_nome": _nome_estado(self.estado)}
   
     
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """Retorna os comandos disponíveis para a porta.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        return {
-            "destrancar": "TRANCADA → DESTRANCADA",
-            "trancar": "DESTRANCADA → TRANCADA (bloqueado se ABERTA)",
-            "abrir": "DESTRANCADA → ABERTA",
-            "fechar": "ABERTA → DESTRANCADA",
-        }
     
     #--------------------------------------------------------------------------------------------------------------
     # CALLBACKS/ LOGGING HELPERS
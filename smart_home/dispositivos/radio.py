@@ -1,8 +1,9 @@
 # smart_home/dispositivos/radio.py : implementação da classe Radio com FSM.
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido, AtributoInvalido
 #--------------------------------------------------------------------------------------------------------------
@@ -27,9 +28,8 @@ class EstacaoRadio(Enum):
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODO AUXILIAR PARA NOMES DE ESTADO
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 #--------------------------------------------------------------------------------------------------------------
 # CLASSE RADIO
 #--------------------------------------------------------------------------------------------------------------
@@ -46,6 +46,64 @@ class Radio(DispositivoBase):
     - definir_volume[x]: LIGADO -> LIGADO (valida 0-100)
     - definir_estacao[ESTACAO]: LIGADO -> LIGADO (valida enum/str)
     """
+
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "ligar": "DESLIGADO → LIGADO (restaura último volume ou 50)",
+        "desligar": "LIGADO → DESLIGADO (salva volume e zera)",
+        "definir_volume": "Ajusta volume (0..100) — requer LIGADO",
+        "definir_estacao": f"Ajusta estação ({', '.join(e.name for e in EstacaoRadio)}) — requer LIGADO",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoRadio.DESLIGADO, EstadoRadio.LIGADO)
+    _TRANSICOES = (
+        # energia
+        {
+            "trigger": "ligar",
+            "source": EstadoRadio.DESLIGADO,
+            "dest": EstadoRadio.LIGADO,
+            "before": "_restaurar_volume_ao_ligar",  # restaura último volume > 0 ou usa 50
+            "after": "_apos_comando",                # log do comando
+        },
+        {
+            "trigger": "desligar",
+            "source": EstadoRadio.LIGADO,
+            "dest": EstadoRadio.DESLIGADO,
+            "before": "_salvar_volume_ao_desligar",  # salva volume > 0 e zera volume atual
+            "after": "_apos_comando",                # log do comando
+        },
+        # definir_volume
+        {
+            "trigger": "definir_volume",
+            "source": EstadoRadio.LIGADO,
+            "dest": EstadoRadio.LIGADO,
+            "before": "_escolher_volume",            # valida e define volume
+            "after": "_apos_comando",                # log do comando
+        },
+        {
+            "trigger": "definir_volume",
+            "source": EstadoRadio.DESLIGADO,
+            "dest": EstadoRadio.DESLIGADO,
+            "after": "_comando_bloqueado",           # log de comando bloqueado
+        },
+        # definir_estacao
+        {
+            "trigger": "definir_estacao",
+            "source": EstadoRadio.LIGADO,
+            "dest": EstadoRadio.LIGADO,
+            "before": "_escolher_estacao",           # valida e define estação
+            "after": "_apos_comando",                # log do comando
+        },
+        {
+            "trigger": "definir_estacao",
+            "source": EstadoRadio.DESLIGADO,
+            "dest": EstadoRadio.DESLIGADO,
+            "after": "_comando_bloqueado",           # log de comando bloqueado
+        },
+    )
+
     def __init__(self, id: str, nome: str,*, volume_inicial: int = 0, estacao_inicial: EstacaoRadio = EstacaoRadio.MPB):
         super().__init__(id=id, nome=nome, tipo=TipoDeDispositivo.RADIO, estado=EstadoRadio.DESLIGADO)
 
@@ -60,64 +118,8 @@ class Radio(DispositivoBase):
         self.volume = volume_inicial
         self.estacao = estacao_inicial
         
-        # estados possíveis e transições
-        estados = [EstadoRadio.DESLIGADO, EstadoRadio.LIGADO]
-        transicoes = [
-            # energia
-            {
-                "trigger": "ligar",
-                "source": EstadoRadio.DESLIGADO,
-                "dest": EstadoRadio.LIGADO,
-                "before": "_restaurar_volume_ao_ligar",  # restaura último volume > 0 ou usa 50
-                "after": "_apos_comando",                # log do comando
-            },
-            {
-                "trigger": "desligar",
-                "source": EstadoRadio.LIGADO,
-                "dest": EstadoRadio.DESLIGADO,
-                "before": "_salvar_volume_ao_desligar",  # salva volume > 0 e zera volume atual
-                "after": "_apos_comando",                # log do comando
-            },
-            # definir_volume
-            {
-                "trigger": "definir_volume",
-                "source": EstadoRadio.LIGADO,
-                "dest": EstadoRadio.LIGADO,
-                "before": "_escolher_volume",            # valida e define volume
-                "after": "_apos_comando",                # log do comando
-            },
-            {
-                "trigger": "definir_volume",
-                "source": EstadoRadio.DESLIGADO,
-                "dest": EstadoRadio.DESLIGADO,
-                "after": "_comando_bloqueado",           # log de comando bloqueado
-            },
-            # definir_estacao
-            {
-                "trigger": "definir_estacao",
-                "source": EstadoRadio.LIGADO,
-                "dest": EstadoRadio.LIGADO,
-                "before": "_escolher_estacao",           # valida e define estação
-                "after": "_apos_comando",                # log do comando
-            },
-            {
-                "trigger": "definir_estacao",
-                "source": EstadoRadio.DESLIGADO,
-                "dest": EstadoRadio.DESLIGADO,
-                "after": "_comando_bloqueado",           # log de comando bloqueado
-            },
-        ]
-        
-        # criar a máquina
-        self.maquina = Machine(
-            model=self,                                                                # o próprio objeto Radio é o modelo
-            states=estados,                                                            # estados possíveis
-            transitions=transicoes,                                                    # transições definidas
-            initial=EstadoRadio.DESLIGADO if self.volume == 0 else EstadoRadio.LIGADO, # estado inicial
-            model_attribute="estado",                                                  # atributo que guarda o estado atual
-            send_event=True,                                                           # envia o evento para os callbacks
-            after_state_change=self._apos_transicao,                                   # callback após qualquer transição
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(EstadoRadio.DESLIGADO if self.volume == 0 else EstadoRadio.LIGADO)
     # ----------------------------------------------------------------------------------------------------------
     # PROPRIEDADES COM VALIDAÇÃO
     # ----------------------------------------------------------------------------------------------------------
@@ -221,20 +223,6 @@ class Radio(DispositivoBase):
             "volume": self.volume,
             "estacao": self.estacao.name,
         }
-    
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """Retorna os comandos disponíveis para o rádio.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        estacoes = ", ".join([estacao.name for estacao in EstacaoRadio]) # listar estações
-        return {
-            "ligar": "DESLIGADO → LIGADO (restaura último volume ou 50)",
-            "desligar": "LIGADO → DESLIGADO (salva volume e zera)",
-            "definir_volume": "Ajusta volume (0..100) — requer LIGADO",
-            "definir_estacao": f"Ajusta estação ({estacoes}) — requer LIGADO",
-        }
         
     #--------------------------------------------------------------------------------------------------------------
     # CALLBACKS/ LOGGING HELPERS
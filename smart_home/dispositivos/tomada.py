@@ -1,9 +1,10 @@
 # smart_home/dispositivos/tomada.py : implementação da classe Tomada com FSM.
 from enum import Enum, auto
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 from datetime import datetime, timedelta
-from transitions import Machine, MachineError
-from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo
+from transitions import MachineError
+from smart_home.core.dispositivos import DispositivoBase, TipoDeDispositivo, nome_estado
 from smart_home.core.eventos import TipoEvento
 from smart_home.core.erros import ComandoInvalido, AtributoInvalido
 #--------------------------------------------------------------------------------------------------------------
@@ -15,9 +16,8 @@ class EstadoTomada(Enum):
 #--------------------------------------------------------------------------------------------------------------
 # MÉTODO AUXILIAR PARA NOMES DE ESTADO
 #--------------------------------------------------------------------------------------------------------------
-def _nome_estado(x):
-    """Converte estado (Enum ou str) para str."""
-    return x.name if hasattr(x, "name") else str(x)
+# Enum ou str -> str; memoizado em core.dispositivos (estados se repetem a cada evento)
+_nome_estado = nome_estado
 #--------------------------------------------------------------------------------------------------------------
 # CLASSE TOMADA
 #--------------------------------------------------------------------------------------------------------------
@@ -35,6 +35,46 @@ class Tomada(DispositivoBase):
       
       
     """
+
+    # comandos suportados (nome -> descrição): fixos por classe, somente leitura
+    _COMANDOS = MappingProxyType({
+        "ligar": "DESLIGADA → LIGADA (inicia medição de consumo)",
+        "desligar": "LIGADA → DESLIGADA (agrega consumo do intervalo)",
+    })
+
+    # FSM (estados e transições) fixa por classe: declarada uma vez; cada instância monta
+    # sua Machine com ela (ver DispositivoBase._vincular_maquina)
+    _ESTADOS = (EstadoTomada.DESLIGADA, EstadoTomada.LIGADA)
+    _TRANSICOES = (
+        # transições válidas
+        {
+            "trigger": "ligar", 
+            "source": EstadoTomada.DESLIGADA, 
+            "dest": EstadoTomada.LIGADA,
+            "before": "_marcar_inicio",               # marca o início do período ligado
+            "after": "_apos_comando"},                # log após o comando
+        {
+            "trigger": "desligar",
+            "source": EstadoTomada.LIGADA,
+            "dest": EstadoTomada.DESLIGADA,
+            "before": "_agregar_consumo_e_limpar",    # agrega consumo e limpa início
+            "after": "_apos_comando"                  # log após o comando
+        }, 
+        # transições inválidas
+        {
+            "trigger": "ligar", 
+            "source": EstadoTomada.LIGADA, 
+            "dest": EstadoTomada.LIGADA,
+            "after": "_comando_bloqueado"             # log após o comando inválido
+        },
+        {
+            "trigger": "desligar",
+            "source": EstadoTomada.DESLIGADA,
+            "dest": EstadoTomada.DESLIGADA,
+            "after": "_comando_bloqueado"             # log após o comando inválido
+        },
+    )
+
     def __init__(self, id: str, nome: str, *, potencia_w: int):
         super().__init__(id=id, nome=nome, tipo=TipoDeDispositivo.TOMADA, estado=EstadoTomada.DESLIGADA)
         
@@ -52,48 +92,8 @@ class Tomada(DispositivoBase):
         self._ligada_desde: Optional[datetime] = None
  
  
-        # estados possíveis e transições
-        estados = [EstadoTomada.DESLIGADA, EstadoTomada.LIGADA]
-        transicoes = [
-            # transições válidas
-            {
-                "trigger": "ligar", 
-                "source": EstadoTomada.DESLIGADA, 
-                "dest": EstadoTomada.LIGADA,
-                "before": "_marcar_inicio",               # marca o início do período ligado
-                "after": "_apos_comando"},                # log após o comando
-            {
-                "trigger": "desligar",
-                "source": EstadoTomada.LIGADA,
-                "dest": EstadoTomada.DESLIGADA,
-                "before": "_agregar_consumo_e_limpar",    # agrega consumo e limpa início
-                "after": "_apos_comando"                  # log após o comando
-            }, 
-            # transições inválidas
-            {
-                "trigger": "ligar", 
-                "source": EstadoTomada.LIGADA, 
-                "dest": EstadoTomada.LIGADA,
-                "after": "_comando_bloqueado"             # log após o comando inválido
-            },
-            {
-                "trigger": "desligar",
-                "source": EstadoTomada.DESLIGADA,
-                "dest": EstadoTomada.DESLIGADA,
-                "after": "_comando_bloqueado"             # log após o comando inválido
-            },
-        ]
-
-        # criar a máquina
-        self.maquina = Machine(
-            model=self,
-            states=estados,
-            transitions=transicoes,
-            initial=EstadoTomada.DESLIGADA,
-            model_attribute="estado",
-            send_event=True,
-            after_state_change=self._apos_transicao,
-        )
+        # cria a FSM desta instância (estados/transições da classe, estado inicial próprio)
+        self._vincular_maquina(EstadoTomada.DESLIGADA)
     #--------------------------------------------------------------------------------------------------------------
     # MÉTODO DE LEITURA DO ATRIBUTO potencia_w
     #--------------------------------------------------------------------------------------------------------------    
@@ -144,16 +144,6 @@ class Tomada(DispositivoBase):
             "ligada_desde":self._ligada_desde.strftime("%d/%m/%Y %H:%M:%S") if self._ligada_desde else None,
         }
         
-    def comandos_disponiveis(self) -> Dict[str, str]:
-        """Retorna os comandos disponíveis para a tomada.
-
-        Returns:
-            Dict[str, str]: Mapeamento de comandos para suas descrições.
-        """
-        return {
-            "ligar": "DESLIGADA → LIGADA (inicia medição de consumo)",
-            "desligar": "LIGADA → DESLIGADA (agrega consumo do intervalo)",
-        }
         
     #--------------------------------------------------------------------------------------------------------------
     # MÉTODOS PARA CÁLCULO DE CONSUMO E MARCAÇÃO DE PERÍODOS DE TEMPO
@@ -0,0 +1,308 @@
+# tests/test_hub.py: lotes de eventos, rotinas e invalidação por versão do Hub
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from smart_home.core import cli
+from smart_home.core.dispositivos import TipoDeDispositivo
+from smart_home.core.erros import DispositivoJaExiste
+from smart_home.core.eventos import TipoEvento
+from smart_home.core.hub import Hub
+from smart_home.core.logger import CsvLogger
+from smart_home.core.observers import (
+    CsvObserverComandos, CsvObserverEventos, CsvObserverTransitions, Observer,
+)
+
+ROTINA = [
+    {"id": "luz_sala", "comando": "ligar"},
+    {"id": "nao_existe", "comando": "ligar"},
+    {"id": "persiana_quarto", "comando": "ajustar", "argumentos": {"percentual": 100}},
+]
+
+
+_silencio = contextlib.ExitStack()
+
+def setUpModule():
+    # os dispositivos imprimem cada comando/transição no stdout; a saída dos testes fica limpa
+    _silencio.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+def tearDownModule():
+    _silencio.close()
+
+
+class Gravador(Observer):
+    """Observer que registra, em ordem, cada entrega individual e cada lote recebido."""
+    def __init__(self) -> None:
+        self.entregas = []  # ("evento", Evento) | ("lote", [Evento, ...])
+
+    def on_event(self, evt):
+        self.entregas.append(("evento", evt))
+
+    def on_events(self, evts):
+        self.entregas.append(("lote", list(evts)))
+
+
+def hub_default() -> Hub:
+    hub = Hub()
+    hub.carregar_defaults()
+    hub.rotinas = {"teste": [dict(p) for p in ROTINA]}
+    return hub
+
+#--------------------------------------------------------------------------------------------------
+# LOTES DE EVENTOS (batch_events)
+#--------------------------------------------------------------------------------------------------
+class TestBatchEvents(unittest.TestCase):
+    def setUp(self):
+        self.hub = hub_default()
+        self.obs = Gravador()
+        self.hub.registrar_observer(self.obs)
+
+    def test_lote_entregue_uma_vez_na_ordem_de_emissao(self):
+        with self.hub.batch_events():
+            self.hub.adicionar("LUZ", "luz_a", "Luz A")
+            self.hub.executar_comando("luz_a", "ligar")
+            self.hub.remover("luz_a")
+            self.assertEqual(self.obs.entregas, [])  # nada entregue dentro do bloco
+        self.assertEqual(len(self.obs.entregas), 1)
+        modo, evts = self.obs.entregas[0]
+        self.assertEqual(modo, "lote")
+        self.assertEqual(
+            [e.tipo for e in evts],
+            [TipoEvento.DISPOSITIVO_ADICIONADO, TipoEvento.COMANDO_EXECUTADO,
+             TipoEvento.TRANSICAO_ESTADO, TipoEvento.DISPOSITIVO_REMOVIDO],
+        )
+
+    def test_lotes_aninhados_entregam_no_bloco_externo(self):
+        with self.hub.batch_events():
+            self.hub.executar_comando("luz_sala", "ligar")
+            with self.hub.batch_events():
+                self.hub.executar_comando("luz_sala", "desligar")
+            self.assertEqual(self.obs.entregas, [])
+        self.assertEqual(len(self.obs.entregas), 1)
+        comandos = [e.payload["comando"] for e in self.obs.entregas[0][1]
+                    if e.tipo is TipoEvento.COMANDO_EXECUTADO]
+        self.assertEqual(comandos, ["ligar", "desligar"])
+
+    def test_fora_do_lote_entrega_evento_a_evento(self):
+        self.hub.executar_comando("luz_sala", "ligar")
+        self.assertTrue(self.obs.entregas)
+        self.assertTrue(all(modo == "evento" for modo, _ in self.obs.entregas))
+
+    def test_observer_com_erro_nao_impede_os_demais(self):
+        class Quebrado(Observer):
+            def on_event(self, evt):
+                raise RuntimeError("falha")
+            def on_events(self, evts):
+                raise RuntimeError("falha")
+        hub = hub_default()
+        hub.registrar_observer(Quebrado())
+        obs = Gravador()
+        hub.registrar_observer(obs)
+        hub.executar_comando("luz_sala", "ligar")
+        with hub.batch_events():
+            hub.executar_comando("luz_sala", "desligar")
+        self.assertEqual([modo for modo, _ in obs.entregas][-1], "lote")
+
+    def test_excecao_no_bloco_ainda_entrega_o_lote(self):
+        with self.assertRaises(RuntimeError):
+            with self.hub.batch_events():
+                self.hub.executar_comando("luz_sala", "ligar")
+                raise RuntimeError("falha no meio do bloco")
+        self.assertEqual([modo for modo, _ in self.obs.entregas], ["lote"])
+        self.assertIsNone(self.hub._lote)  # o hub volta a entregar evento a evento
+
+    def test_observer_sem_on_events_recebe_um_a_um(self):
+        class SoEvento(Observer):
+            def __init__(self):
+                self.tipos = []
+            def on_event(self, evt):
+                self.tipos.append(evt.tipo)
+        so = SoEvento()
+        self.hub.registrar_observer(so)
+        with self.hub.batch_events():
+            self.hub.executar_comando("luz_sala", "ligar")
+        self.assertEqual(so.tipos, [e.tipo for e in self.obs.entregas[0][1]])
+
+    def test_observers_csv_gravam_o_lote_numa_escrita(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            logs = Path(tmp)
+            hub = hub_default()
+            for obs in (CsvObserverTransitions(logs / "transitions.csv"),
+                        CsvObserverEventos(logs / "events.csv"),
+                        CsvObserverComandos(logs / "commands.csv")):
+                hub.registrar_observer(obs)
+            gravador = Gravador()
+            hub.registrar_observer(gravador)
+            logger = CsvLogger()
+            try:
+                with mock.patch.object(logger, "write_rows_seq", wraps=logger.write_rows_seq) as escrita:
+                    hub.executar_rotina("teste")
+                logger.flush()
+                # uma escrita por arquivo para a rotina inteira
+                self.assertEqual(sorted(Path(c.args[0]).name for c in escrita.call_args_list),
+                                 ["commands.csv", "events.csv", "transitions.csv"])
+                tipos = [e.tipo for e in gravador.entregas[0][1]]
+                def linhas(nome):  # sem o cabeçalho
+                    return (logs / nome).read_text(encoding="utf-8").splitlines()[1:]
+                self.assertEqual(len(linhas("events.csv")), len(tipos))
+                self.assertEqual(len(linhas("commands.csv")), tipos.count(TipoEvento.COMANDO_EXECUTADO))
+                self.assertEqual(len(linhas("transitions.csv")), tipos.count(TipoEvento.TRANSICAO_ESTADO))
+                self.assertIn("ROTINA_EXECUTADA", linhas("events.csv")[-1])
+            finally:
+                logger.close()
+
+#--------------------------------------------------------------------------------------------------
+# CRUD: id duplicado não altera o hub
+#--------------------------------------------------------------------------------------------------
+class TestAdicionar(unittest.TestCase):
+    def test_id_duplicado_mantem_o_existente(self):
+        hub = hub_default()
+        obs = Gravador()
+        hub.registrar_observer(obs)
+        original, versao = hub.obter("luz_sala"), hub.versao
+        with self.assertRaises(DispositivoJaExiste):
+            hub.adicionar("TOMADA", "luz_sala", "Outra", potencia_w=10)
+        self.assertIs(hub.obter("luz_sala"), original)
+        self.assertNotIn("luz_sala", {d.id for d in hub.listar_por_tipo(TipoDeDispositivo.TOMADA)})
+        self.assertEqual((hub.versao, obs.entregas), (versao, []))
+
+#--------------------------------------------------------------------------------------------------
+# ROTINAS: executar_rotina x executar_rotina_iter
+#--------------------------------------------------------------------------------------------------
+class TestRotina(unittest.TestCase):
+    def test_iterador_e_resumo_equivalentes(self):
+        hub_a, hub_b = hub_default(), hub_default()
+        resumo = hub_a.executar_rotina("teste")
+        passos = list(hub_b.executar_rotina_iter("teste"))
+        self.assertEqual(resumo, Hub.resumo_rotina("teste", passos))
+        self.assertEqual((resumo["total"], resumo["sucesso"], resumo["falha"]), (3, 2, 1))
+        self.assertEqual(
+            [d.estado for d in hub_a.listar()], [d.estado for d in hub_b.listar()]
+        )
+
+    def test_evento_da_rotina_e_o_resumo_retornado(self):
+        hub = hub_default()
+        obs = Gravador()
+        hub.registrar_observer(obs)
+        resumo = hub.executar_rotina("teste")
+        # executar_rotina entrega os passos e o evento final num único lote
+        self.assertEqual([modo for modo, _ in obs.entregas], ["lote"])
+        ultimo = obs.entregas[0][1][-1]
+        self.assertIs(ultimo.tipo, TipoEvento.ROTINA_EXECUTADA)
+        self.assertEqual(ultimo.payload, resumo)
+
+    def test_iterador_emite_evento_so_ao_esgotar(self):
+        hub = hub_default()
+        obs = Gravador()
+        hub.registrar_observer(obs)
+        it = hub.executar_rotina_iter("teste")
+        next(it)
+        tipos = [e.tipo for _, e in obs.entregas]
+        self.assertNotIn(TipoEvento.ROTINA_EXECUTADA, tipos)
+        list(it)
+        self.assertIs(obs.entregas[-1][1].tipo, TipoEvento.ROTINA_EXECUTADA)
+
+#--------------------------------------------------------------------------------------------------
+# ÍNDICE POR TIPO (listar_por_tipo)
+#--------------------------------------------------------------------------------------------------
+class TestIndicePorTipo(unittest.TestCase):
+    def setUp(self):
+        self.hub = hub_default()
+
+    def por_varredura(self, tipo):
+        return [d for d in self.hub.listar() if d.tipo is tipo]
+
+    def test_indice_por_tipo_acompanha_o_hub(self):
+        hub = self.hub
+        luzes = {d.id for d in hub.listar_por_tipo(TipoDeDispositivo.LUZ)}
+        hub.adicionar("LUZ", "luz_a", "Luz A")
+        self.assertEqual({d.id for d in hub.listar_por_tipo(TipoDeDispositivo.LUZ)}, luzes | {"luz_a"})
+        hub.remover("luz_a")
+        self.assertEqual({d.id for d in hub.listar_por_tipo(TipoDeDispositivo.LUZ)}, luzes)
+        hub.carregar_defaults()
+        self.assertEqual({d.id for d in hub.listar_por_tipo(TipoDeDispositivo.LUZ)}, luzes)
+        esperado = {d.id for d in hub.listar() if d.tipo is TipoDeDispositivo.LUZ}
+        self.assertEqual(luzes, esperado)
+
+    def test_mesma_ordem_que_a_varredura(self):
+        hub = self.hub
+        hub.adicionar("TOMADA", "tomada_a", "Tomada A", potencia_w=10)
+        hub.remover("tomada_tv")
+        hub.adicionar("TOMADA", "tomada_tv", "Tomada da TV", potencia_w=150)
+        for tipo in TipoDeDispositivo:
+            with self.subTest(tipo=tipo.name):
+                self.assertEqual(hub.listar_por_tipo(tipo), self.por_varredura(tipo))
+
+    def test_lista_devolvida_e_uma_copia(self):
+        luzes = self.hub.listar_por_tipo(TipoDeDispositivo.LUZ)
+        luzes.clear()
+        self.assertEqual(self.hub.listar_por_tipo(TipoDeDispositivo.LUZ),
+                         self.por_varredura(TipoDeDispositivo.LUZ))
+
+    def test_tipo_sem_dispositivos_devolve_lista_vazia(self):
+        for d in self.hub.listar_por_tipo(TipoDeDispositivo.PORTA):
+            self.hub.remover(d.id)
+        self.assertEqual(self.hub.listar_por_tipo(TipoDeDispositivo.PORTA), [])
+        self.assertEqual(Hub().listar_por_tipo(TipoDeDispositivo.PORTA), [])
+
+    def test_carregar_config_reconstroi_o_indice(self):
+        hub = self.hub
+        hub.adicionar("LUZ", "luz_a", "Luz A")
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = Path(tmp) / "config.json"
+            hub.salvar_config(cfg)
+            outro = hub_default()
+            outro.adicionar("RADIO", "radio_extra", "Rádio Extra")
+            outro.carregar_config(cfg)  # substitui os dispositivos: o rádio extra sai do índice
+        for tipo in TipoDeDispositivo:
+            with self.subTest(tipo=tipo.name):
+                self.assertEqual([d.id for d in outro.listar_por_tipo(tipo)],
+                                 [d.id for d in hub.listar_por_tipo(tipo)])
+
+#--------------------------------------------------------------------------------------------------
+# INVALIDAÇÃO: versão do hub e cache da listagem da CLI
+#--------------------------------------------------------------------------------------------------
+class TestInvalidacao(unittest.TestCase):
+    def setUp(self):
+        self.hub = hub_default()
+
+    def assertMuda(self, acao):
+        antes = self.hub.versao
+        acao()
+        self.assertGreater(self.hub.versao, antes)
+
+    def test_cada_mutacao_incrementa_a_versao(self):
+        hub = self.hub
+        self.assertMuda(lambda: hub.adicionar("TOMADA", "tomada_a", "Tomada A", potencia_w=10))
+        self.assertMuda(lambda: hub.executar_comando("tomada_a", "ligar"))
+        self.assertMuda(lambda: hub.alterar_atributo("luz_sala", "brilho", 10))
+        self.assertMuda(lambda: hub.executar_rotina("teste"))
+        self.assertMuda(lambda: hub.remover("tomada_a"))
+        self.assertMuda(hub.carregar_defaults)
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = Path(tmp) / "config.json"
+            hub.salvar_config(cfg)
+            self.assertMuda(lambda: hub.carregar_config(cfg))
+
+    def test_listagem_da_cli_reflete_mudanca_de_estado(self):
+        def listar() -> str:
+            with cli._bulk.capture() as cap:
+                cli.listar_dispositivos(self.hub)
+            return cap.get()
+
+        self.hub.executar_comando("luz_sala", "desligar")
+        antes = listar()
+        self.assertEqual(listar(), antes)  # hub inalterado: mesma saída (cache)
+        self.hub.executar_comando("luz_sala", "ligar")
+        depois = listar()
+        self.assertNotEqual(depois, antes)
+        linha = next(l for l in depois.splitlines() if "luz_sala" in l)
+        self.assertIn("LIGADA", linha)
+        self.assertNotIn("DESLIGADA", linha)
+
+
+if __name__ == "__main__":
+    unittest.main()
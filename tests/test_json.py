@@ -0,0 +1,77 @@
+# tests/test_json.py: mesma saída de _json.dumps com orjson e com o json da stdlib
+import contextlib
+import io
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from smart_home.core import _json
+from smart_home.core.hub import Hub
+from smart_home.dispositivos.luz import CorLuz
+from smart_home.dispositivos.radio import EstacaoRadio
+
+# o caso só é comparado se o orjson estiver instalado; a stdlib é sempre testada
+BACKENDS = ("orjson", "stdlib") if _json.orjson is not None else ("stdlib",)
+
+DADOS = {
+    "cor": CorLuz.QUENTE,
+    "lista": [EstacaoRadio.ROCK, {"aninhado": CorLuz.FRIA}, 1, "texto"],
+    "tupla": (CorLuz.NEUTRA, None),
+    "quando": datetime(2025, 9, 15, 10, 0, 0),
+    "sem_enum": {"x": [1, 2.5, True]},
+}
+
+
+def _backend(nome: str):
+    """Contexto que força o backend pedido (o módulo escolhe pelo atributo `orjson`)."""
+    return mock.patch.object(_json, "orjson", None) if nome == "stdlib" else contextlib.nullcontext()
+
+
+class TestBackends(unittest.TestCase):
+    def test_mesma_saida_nos_dois_backends(self):
+        for indent in (False, True):
+            saidas = set()
+            for nome in BACKENDS:
+                with _backend(nome):
+                    saidas.add(_json.dumps(DADOS, indent=indent))
+            self.assertEqual(len(saidas), 1, saidas)
+
+    def test_enum_gravado_pelo_nome(self):
+        for nome in BACKENDS:
+            with self.subTest(backend=nome), _backend(nome):
+                lido = _json.loads(_json.dumps(DADOS))
+                self.assertEqual(lido["cor"], "QUENTE")
+                self.assertEqual(lido["lista"][:2], ["ROCK", {"aninhado": "FRIA"}])
+                self.assertEqual(lido["tupla"], ["NEUTRA", None])
+                self.assertEqual(lido["quando"], "2025-09-15T10:00:00")
+
+    def test_sem_enum_o_objeto_nao_e_copiado(self):
+        obj = DADOS["sem_enum"]
+        self.assertIs(_json._enums_por_nome(obj), obj)
+        self.assertIs(DADOS["cor"], CorLuz.QUENTE)  # a entrada não é alterada
+
+    def test_rotina_com_enum_ida_e_volta(self):
+        with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as tmp:
+            for nome in BACKENDS:
+                with self.subTest(backend=nome), _backend(nome):
+                    hub = Hub()
+                    hub.carregar_defaults()
+                    # argumentos como a CLI os monta (_coerce_enum devolve o membro do Enum)
+                    hub.rotinas = {"fria": [
+                        {"id": "luz_sala", "comando": "ligar"},
+                        {"id": "luz_sala", "comando": "definir_cor", "argumentos": {"cor": CorLuz.FRIA}},
+                    ]}
+                    cfg = Path(tmp) / f"{nome}.json"
+                    hub.salvar_config(cfg)
+                    outro = Hub()
+                    outro.carregar_config(cfg)
+                    self.assertEqual(outro.rotinas["fria"][1]["argumentos"], {"cor": "FRIA"})
+                    resumo = outro.executar_rotina("fria")
+                    self.assertEqual(resumo["falha"], 0, resumo)
+                    self.assertIs(outro.obter("luz_sala").cor, CorLuz.FRIA)
+
+
+if __name__ == "__main__":
+    unittest.main()
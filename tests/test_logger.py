@@ -0,0 +1,104 @@
+# tests/test_logger.py: CsvLogger síncrono e com a thread escritora (modo assíncrono)
+import csv
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from smart_home.core.logger import CsvLogger
+
+HEADERS = ("n", "origem")
+
+
+def linhas(path: Path) -> list:
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+class TestCsvLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.log = CsvLogger()
+
+    def tearDown(self):
+        self.log.close()  # volta ao modo síncrono e fecha os handles (singleton compartilhado)
+        self.tmp.cleanup()
+
+    def test_sincrono_visivel_apos_a_chamada(self):
+        a = self.dir / "a.csv"
+        self.log.write_row(a, HEADERS, {"n": 1, "origem": "x", "ignorada": "?"})
+        self.log.write_row_seq(a, HEADERS, (2, "y"))
+        self.assertEqual(linhas(a), [list(HEADERS), ["1", "x"], ["2", "y"]])
+
+    def test_assincrono_preserva_a_ordem_por_arquivo(self):
+        self.log.iniciar_assincrono()
+        arquivos = (self.dir / "a.csv", self.dir / "b.csv")
+
+        def produzir(origem: str) -> None:
+            for i in range(500):
+                self.log.write_row_seq(arquivos[i % 2], HEADERS, (i, origem))
+
+        threads = [threading.Thread(target=produzir, args=(f"t{k}",)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.log.flush()
+        for resto, path in enumerate(arquivos):
+            corpo = linhas(path)
+            self.assertEqual(corpo[0], list(HEADERS))
+            self.assertEqual(len(corpo), 1 + 4 * 250)
+            for k in range(4):
+                ns = [int(n) for n, origem in corpo[1:] if origem == f"t{k}"]
+                self.assertEqual(ns, list(range(resto, 500, 2)))
+
+    def test_falha_em_um_arquivo_nao_descarta_os_outros(self):
+        self.log.iniciar_assincrono()
+        bloqueio = self.dir / "arquivo_comum"
+        bloqueio.write_text("")
+        invalido = bloqueio / "x.csv"  # diretório pai é um arquivo: a abertura falha
+        bom = self.dir / "bom.csv"
+        for i in range(50):
+            self.log.write_row_seq(invalido, HEADERS, (i, "ruim"))
+            self.log.write_row_seq(bom, HEADERS, (i, "bom"))
+        self.log.flush()
+        self.assertEqual(len(linhas(bom)), 51)
+        self.log.write_row_seq(bom, HEADERS, (50, "bom"))  # a thread escritora segue viva
+        self.log.flush()
+        self.assertEqual(len(linhas(bom)), 52)
+
+    def test_close_grava_a_fila_e_volta_ao_sincrono(self):
+        self.log.iniciar_assincrono()
+        a = self.dir / "a.csv"
+        for i in range(1000):
+            self.log.write_row_seq(a, HEADERS, (i, "x"))
+        self.log.close()
+        self.assertEqual(len(linhas(a)), 1001)
+        self.log.write_row_seq(a, HEADERS, (1000, "x"))  # síncrono: visível sem flush
+        self.assertEqual(len(linhas(a)), 1002)
+
+    def test_close_concorrente_nao_perde_linhas(self):
+        a = self.dir / "a.csv"
+        for _ in range(5):
+            self.log.iniciar_assincrono()
+            inicio = threading.Barrier(5)
+
+            def produzir() -> None:
+                inicio.wait()
+                for i in range(200):
+                    self.log.write_row_seq(a, HEADERS, (i, "x"))
+
+            threads = [threading.Thread(target=produzir) for _ in range(4)]
+            for t in threads:
+                t.start()
+            inicio.wait()
+            self.log.close()  # no meio das escritas: o que vier depois segue síncrono
+            for t in threads:
+                t.join()
+        self.log.flush()
+        self.assertEqual(len(linhas(a)), 1 + 5 * 4 * 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+# tests/test_persistencia.py: gravação do config.json (streaming e troca atômica)
+import contextlib
+import io
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from smart_home.core import _json, persistencia
+from smart_home.core.hub import Hub
+
+_silencio = contextlib.ExitStack()
+
+def setUpModule():
+    # os dispositivos imprimem cada comando/transição no stdout; a saída dos testes fica limpa
+    _silencio.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+def tearDownModule():
+    _silencio.close()
+
+
+def hub_com(n_extras: int) -> Hub:
+    hub = Hub()
+    hub.carregar_defaults()
+    for i in range(n_extras):
+        hub.adicionar("TOMADA", f"tomada_{i}", f"Tomada {i}", potencia_w=i)
+    hub.rotinas = {"noite": [{"id": "luz_sala", "comando": "desligar"}], "vazia": []}
+    return hub
+
+def modo(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+#--------------------------------------------------------------------------------------------------
+# STREAMING: MESMA SAÍDA DO DUMP ÚNICO
+#--------------------------------------------------------------------------------------------------
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _comparar(self, hub: Hub) -> None:
+        unico, stream = self.dir / "unico.json", self.dir / "stream.json"
+        persistencia.salvar_config_hub(unico, hub)
+        with mock.patch.object(persistencia, "LIMITE_CONFIG_STREAM", -1):
+            persistencia.salvar_config_hub(stream, hub)
+        self.assertEqual(stream.read_bytes(), unico.read_bytes())
+        self.assertEqual(
+            unico.read_bytes(), _json.dumps(persistencia._snapshot_config(hub), indent=True)
+        )
+
+    def test_stream_igual_ao_dump_unico(self):
+        self._comparar(hub_com(5))
+
+    def test_stream_igual_sem_dispositivos_e_sem_rotinas(self):
+        hub = Hub()
+        self._comparar(hub)
+
+    def test_stream_igual_no_backend_stdlib(self):
+        with mock.patch.object(_json, "orjson", None):
+            self._comparar(hub_com(3))
+
+    def test_config_grande_e_recarregado(self):
+        hub = hub_com(persistencia.LIMITE_CONFIG_STREAM + 1)
+        cfg = self.dir / "config.json"
+        hub.salvar_config(cfg)
+        outro = Hub()
+        outro.carregar_config(cfg)
+        self.assertEqual(len(outro), len(hub))
+        self.assertEqual(outro.rotinas, hub.rotinas)
+
+#--------------------------------------------------------------------------------------------------
+# TROCA ATÔMICA: PERMISSÕES, FALHAS E TEMPORÁRIOS
+#--------------------------------------------------------------------------------------------------
+class TestGravacaoAtomica(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.cfg = self.dir / "config.json"
+        self.hub = hub_com(0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sobras(self) -> list:
+        return [p.name for p in self.dir.iterdir() if p.name != "config.json"]
+
+    def test_arquivo_novo_segue_a_umask(self):
+        umask = os.umask(0o022)
+        try:
+            self.hub.salvar_config(self.cfg)
+        finally:
+            os.umask(umask)
+        self.assertEqual(modo(self.cfg), 0o644)
+
+    def test_mantem_as_permissoes_do_destino(self):
+        for atual in (0o644, 0o640):
+            for limite in (persistencia.LIMITE_CONFIG_STREAM, -1):  # dump único e streaming
+                with self.subTest(modo=oct(atual), stream=limite < 0):
+                    self.cfg.write_text("{}", encoding="utf-8")
+                    os.chmod(self.cfg, atual)
+                    with mock.patch.object(persistencia, "LIMITE_CONFIG_STREAM", limite):
+                        self.hub.salvar_config(self.cfg)
+                    self.assertEqual(modo(self.cfg), atual)
+
+    def test_falha_na_escrita_preserva_o_config_e_limpa_o_temporario(self):
+        self.cfg.write_text('{"antigo": true}', encoding="utf-8")
+        def quebrar(f):
+            f.write(b"{parcial")
+            raise OSError("disco cheio")
+        with self.assertRaises(OSError):
+            persistencia._gravar_atomico(self.cfg, quebrar)
+        self.assertEqual(self.cfg.read_text(encoding="utf-8"), '{"antigo": true}')
+        self.assertEqual(self._sobras(), [])
+
+    def test_falha_no_fdopen_fecha_o_descritor_e_limpa_o_temporario(self):
+        fds = []
+        mkstemp = tempfile.mkstemp
+        def mkstemp_espiao(*a, **kw):
+            fd, nome = mkstemp(*a, **kw)
+            fds.append(fd)
+            return fd, nome
+        with mock.patch.object(persistencia.tempfile, "mkstemp", mkstemp_espiao), \
+             mock.patch.object(persistencia.os, "fdopen", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                persistencia._gravar_atomico(self.cfg, lambda f: None)
+        with self.assertRaises(OSError):
+            os.fstat(fds[0])  # descritor fechado
+        self.assertEqual(self._sobras(), [])
+        self.assertFalse(self.cfg.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
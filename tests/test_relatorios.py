@@ -0,0 +1,107 @@
+# tests/test_relatorios.py: cache de leitura dos relatórios (CSV/config) x arquivos reescritos
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from smart_home.core import relatorios as R
+
+CABECALHO = "timestamp,id_dispositivo,evento,estado_origem,estado_destino\n"
+
+
+def _reescrever_mesmo_tick(path: Path, texto: str) -> None:
+    """Reescreve o arquivo (mesmo tamanho) e restaura o mtime anterior: simula duas escritas
+    dentro do mesmo tick de mtime do sistema de arquivos."""
+    st = path.stat()
+    path.write_text(texto, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert path.stat().st_size == st.st_size
+
+
+class TestCacheCsv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "transitions.csv"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_e_relido(self):
+        self.csv.write_text(CABECALHO + "2025-09-15T10:00:00,luz_a,ligar,desligada,ligada\n", encoding="utf-8")
+        self.assertEqual(len(R.ler_csv_transitions(self.csv)), 1)
+        with self.csv.open("a", encoding="utf-8") as f:
+            f.write("2025-09-15T10:05:00,luz_a,desligar,ligada,desligada\n")
+        self.assertEqual([r["evento"] for r in R.ler_csv_transitions(self.csv)], ["ligar", "desligar"])
+
+    def test_reescrita_com_mesmo_tamanho_no_mesmo_tick(self):
+        self.csv.write_text(CABECALHO + "2025-09-15T10:00:00,luz_a,ligar,desligada,ligada\n", encoding="utf-8")
+        self.assertEqual(R.ler_csv_transitions(self.csv)[0]["id_dispositivo"], "luz_a")
+        _reescrever_mesmo_tick(self.csv, CABECALHO + "2025-09-15T10:00:00,luz_b,ligar,desligada,ligada\n")
+        self.assertEqual(R.ler_csv_transitions(self.csv)[0]["id_dispositivo"], "luz_b")
+
+    def test_arquivo_removido_devolve_vazio(self):
+        self.csv.write_text(CABECALHO + "2025-09-15T10:00:00,luz_a,ligar,desligada,ligada\n", encoding="utf-8")
+        R.ler_csv_transitions(self.csv)
+        self.csv.unlink()
+        self.assertEqual(R.ler_csv_transitions(self.csv), [])
+
+    def test_linhas_do_cache_nao_sao_alteradas_pelo_chamador(self):
+        self.csv.write_text(CABECALHO + "2025-09-15T10:00:00,luz_a,ligar,desligada,ligada\n", encoding="utf-8")
+        R.ler_csv_transitions(self.csv).clear()
+        self.assertEqual(len(R.ler_csv_transitions(self.csv)), 1)
+        R.ler_csv_transitions(self.csv)[0]["id_dispositivo"] = "X"
+        self.assertEqual(R.ler_csv_transitions(self.csv)[0]["id_dispositivo"], "luz_a")
+
+    def test_eventos_com_extra_nao_alteram_o_cache(self):
+        eventos = self.csv.with_name("events.csv")
+        eventos.write_text(
+            "timestamp,tipo_evento,id_dispositivo,extra\n"
+            '2025-09-15T10:00:00,comando_executado,luz_a,"{""comando"": ""ligar""}"\n',
+            encoding="utf-8",
+        )
+        self.assertEqual(R.ler_csv_events(eventos)[0]["extra"], {"comando": "ligar"})
+        self.assertEqual(R.ler_csv_events(eventos, com_extra=False)[0]["extra"], '{"comando": "ligar"}')
+        R.ler_csv_events(eventos)[0]["extra"]["comando"] = "X"
+        self.assertEqual(R.ler_csv_events(eventos)[0]["extra"], {"comando": "ligar"})
+
+
+class TestCacheConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cfg = Path(self.tmp.name) / "config.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _config(tipo: str) -> str:
+        return json.dumps({"dispositivos": [{"id": "disp_1", "tipo": tipo, "nome": "X", "atributos": {}}]})
+
+    def test_reescrita_com_mesmo_tamanho_no_mesmo_tick(self):
+        self.cfg.write_text(self._config("LUZ"), encoding="utf-8")
+        self.assertEqual(R.ler_config(self.cfg)["disp_1"]["tipo"], "LUZ")
+        _reescrever_mesmo_tick(self.cfg, self._config("PAR"))
+        self.assertEqual(R.ler_config(self.cfg)["disp_1"]["tipo"], "PAR")
+
+    def test_indice_do_cache_nao_e_alterado_pelo_chamador(self):
+        self.cfg.write_text(self._config("TOMADA"), encoding="utf-8")
+        cfg = R.ler_config(self.cfg)
+        cfg["disp_1"]["tipo"] = "X"
+        cfg["disp_1"]["atributos"]["potencia_w"] = 999
+        cfg.clear()
+        self.assertEqual(R.ler_config(self.cfg)["disp_1"], {
+            "tipo": "TOMADA", "nome": "X", "estado": None, "atributos": {},
+        })
+
+    def test_substituicao_atomica_e_relida(self):
+        self.cfg.write_text(self._config("LUZ"), encoding="utf-8")
+        R.ler_config(self.cfg)
+        novo = self.cfg.with_suffix(".tmp")
+        novo.write_text(self._config("RADIO"), encoding="utf-8")
+        os.replace(novo, self.cfg)  # como salvar_config_hub grava
+        self.assertEqual(R.ler_config(self.cfg)["disp_1"]["tipo"], "RADIO")
+
+
+if __name__ == "__main__":
+    unittest.main()